@@ -1,20 +1,34 @@
 import sys
+import time
+# 启动耗时分解的起点
+STARTED_AT = time.perf_counter()
 import json
-import requests
+import hashlib
 import re
-import time
-import ctypes
-from ctypes import wintypes
+import random
+import heapq
+import functools
+import enum
+import codecs
+import collections
+import itertools
+import threading
+import os
+import queue
+import logging
+import logging.handlers
 from datetime import datetime
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlencode
 from typing import Dict, List, Optional
 
 from PySide6.QtCore import (Qt, QTimer, QSettings, QThread, Signal, QPoint, 
                            QPropertyAnimation, QEasingCurve, QRect, QSize,
-                           QParallelAnimationGroup, QSequentialAnimationGroup, QObject)
+                           QParallelAnimationGroup, QSequentialAnimationGroup, QObject,
+                           QRunnable, QThreadPool, QAbstractListModel, QModelIndex,
+                           QEvent, QStandardPaths)
 from PySide6.QtGui import (QIcon, QFont, QAction, QColor, QPalette, QPixmap, 
                           QPainter, QGuiApplication, QLinearGradient, QBrush,
-                          QDesktopServices, QMouseEvent, QPen)
+                          QDesktopServices, QMouseEvent, QPen, QFontMetrics)
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                               QHBoxLayout, QLabel, QLineEdit, QPushButton, 
                               QTextEdit, QListWidget, QListWidgetItem, 
@@ -22,16 +36,234 @@ from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                               QMessageBox, QCheckBox, QScrollArea, QFrame, 
                               QSizePolicy, QComboBox, QGroupBox, QSpinBox, 
                               QTabWidget, QGridLayout, QGraphicsDropShadowEffect,
-                              QProgressBar, QSplitter, QToolButton, QSlider)
+                              QProgressBar, QSplitter, QToolButton, QSlider,
+                              QListView, QStyledItemDelegate, QStyle, QFileDialog)
 
 SERVER = "https://dlass.tech" 
 
-try:
-    import socketio
-    SOCKETIO_AVAILABLE = True
-except ImportError:
-    SOCKETIO_AVAILABLE = False
-    print("python-socketio not available")
+# 各组件的日志记录器，输出位置和级别由 setup_logging() 统一配置
+log = logging.getLogger("dlass")
+socket_log = logging.getLogger("dlass.socketio")
+api_log = logging.getLogger("dlass.api")
+scheduler_log = logging.getLogger("dlass.scheduler")
+fetch_log = logging.getLogger("dlass.fetcher")
+liveness_log = logging.getLogger("dlass.liveness")
+data_log = logging.getLogger("dlass.data")
+ui_log = logging.getLogger("dlass.ui")
+
+def setup_logging(level=None):
+    """
+    日志先进队列，由后台线程写入滚动文件（有控制台时同时输出到stderr），
+    调用方不会因为磁盘IO阻塞。级别依次取参数、环境变量 DLASS_LOG_LEVEL、
+    设置项 log_level，默认 INFO；高频路径只打 DEBUG，默认级别下直接跳过。
+    返回 QueueListener，退出前需要 stop() 把剩余日志写完。
+    """
+    if level is None:
+        level = os.environ.get("DLASS_LOG_LEVEL") or QSettings("WhiteboardClient", "Config").value("log_level", "INFO")
+    level = logging.getLevelName(str(level).upper())
+    if not isinstance(level, int):
+        level = logging.INFO
+        
+    formatter = logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    handlers = []
+    folder = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation) or "."
+    try:
+        os.makedirs(folder, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            os.path.join(folder, "dlass.log"), maxBytes=1024 * 1024, backupCount=3, encoding="utf-8")
+        handlers.append(file_handler)
+    except OSError:
+        pass
+    # 无控制台的打包版本里 sys.stderr 是 None
+    if sys.stderr is not None:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    log.handlers = [logging.handlers.QueueHandler(log_queue)]
+    log.setLevel(level)
+    log.propagate = False
+    listener.start()
+    return listener
+
+# requests 和 socketio 导入较慢，等窗口显示出来、真正要联网时再加载
+requests = None
+socketio = None
+
+def load_requests():
+    global requests
+    if requests is None:
+        import requests as module
+        import requests.adapters
+        requests = module
+    return requests
+
+# JSON解码后端：装了 orjson 或 msgspec 时优先使用，否则用标准库；同样等第一次解码时再导入
+json_loads = None
+
+def load_json_backends():
+    backends = {}
+    try:
+        import orjson
+        backends['orjson'] = orjson.loads
+    except ImportError:
+        pass
+    try:
+        import msgspec
+        backends['msgspec'] = msgspec.json.decode
+    except ImportError:
+        pass
+    backends['json'] = json.loads
+    return backends
+
+def decode_json(body):
+    global json_loads
+    if json_loads is None:
+        name, json_loads = next(iter(load_json_backends().items()))
+        log.info("JSON解码后端: %s", name)
+    return json_loads(body)
+
+def socketio_available():
+    global socketio
+    if socketio is None:
+        try:
+            import socketio as module
+            socketio = module
+        except ImportError:
+            socketio = False
+            log.warning("python-socketio not available")
+    return bool(socketio)
+
+# 单个指标的样本环形缓冲区：next()取下标在CPython里是原子的，写样本不需要加锁；
+# 次数和错误数是读-改-写，多个工作线程同时记录时要加锁，否则会丢计数
+class MetricSeries:
+    def __init__(self, size):
+        self.samples = [None] * size
+        self.cursor = itertools.count()
+        self.lock = threading.Lock()
+        self.count = 0
+        self.errors = 0
+        
+    def add(self, elapsed_ms, ok):
+        index = next(self.cursor)
+        self.samples[index % len(self.samples)] = elapsed_ms
+        with self.lock:
+            self.count = max(self.count, index + 1)
+            if not ok:
+                self.errors += 1
+            
+    def recent(self):
+        return [sample for sample in self.samples if sample is not None]
+
+# 热点路径的耗时统计，在托盘菜单的“诊断信息”里查看
+class Metrics:
+    # 直方图桶的上界（毫秒）
+    BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+    
+    def __init__(self, window=512):
+        self.window = window
+        self.series = {}
+        # 不是耗时的计数和当前值（如队列长度、丢弃次数）
+        self.counters = {}
+        self.counters_lock = threading.Lock()
+        self.started_at = time.time()
+        
+    def record(self, name, elapsed_ms, ok=True):
+        series = self.series.get(name)
+        if series is None:
+            series = self.series.setdefault(name, MetricSeries(self.window))
+        series.add(elapsed_ms, ok)
+        
+    def count(self, name, n=1):
+        with self.counters_lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+        
+    def gauge(self, name, value):
+        self.counters[name] = value
+        
+    def timed(self, name):
+        # 装饰器：记录函数耗时，抛出异常算一次错误
+        def decorator(fn):
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                ok = False
+                try:
+                    result = fn(*args, **kwargs)
+                    ok = True
+                    return result
+                finally:
+                    self.record(name, (time.perf_counter() - start) * 1000, ok)
+            wrapper.__name__ = fn.__name__
+            wrapper.__doc__ = fn.__doc__
+            return wrapper
+        return decorator
+        
+    def clear(self):
+        self.series = {}
+        self.counters = {}
+        self.started_at = time.time()
+        
+    def snapshot(self):
+        result = {}
+        for name, series in sorted(self.series.items()):
+            samples = sorted(series.recent())
+            histogram = [0] * (len(self.BUCKETS) + 1)
+            for sample in samples:
+                bucket = 0
+                while bucket < len(self.BUCKETS) and sample > self.BUCKETS[bucket]:
+                    bucket += 1
+                histogram[bucket] += 1
+                
+            def percentile(p):
+                if not samples:
+                    return None
+                return round(samples[min(len(samples) - 1, int(len(samples) * p))], 3)
+                
+            result[name] = {
+                'count': series.count,
+                'errors': series.errors,
+                'error_rate': round(series.errors / series.count, 4) if series.count else 0,
+                'p50_ms': percentile(0.5),
+                'p95_ms': percentile(0.95),
+                'p99_ms': percentile(0.99),
+                'max_ms': round(samples[-1], 3) if samples else None,
+                'histogram': dict(zip([f"<={bound}ms" for bound in self.BUCKETS] + ["inf"], histogram))
+            }
+        return result
+        
+    def export(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'started_at': self.started_at,
+                'exported_at': time.time(),
+                'window': self.window,
+                'metrics': self.snapshot(),
+                'counters': dict(sorted(self.counters.items()))
+            }, f, ensure_ascii=False, indent=2)
+
+METRICS = Metrics()
+
+# 启动各阶段距进程启动的耗时，记入METRICS并写日志
+class StartupProfile:
+    PHASES = ("import", "windows", "first_paint", "cached_data", "first_items", "first_data")
+    
+    def __init__(self, started_at):
+        self.started_at = started_at
+        self.marks = {}
+        
+    def mark(self, phase):
+        if phase in self.marks:
+            return
+        elapsed = (time.perf_counter() - self.started_at) * 1000
+        self.marks[phase] = elapsed
+        METRICS.record(f"startup {phase}", elapsed)
+        if phase == "first_data":
+            ui_log.info("启动耗时: %s", ", ".join(
+                f"{name} {self.marks[name]:.0f}ms" for name in self.PHASES if name in self.marks))
+
+STARTUP = StartupProfile(STARTED_AT)
 
 # 在SocketIOClientThread类中添加对action_id=2的处理
 class SocketIOClientThread(QThread):
@@ -39,16 +271,36 @@ class SocketIOClientThread(QThread):
     connected = Signal()
     disconnected = Signal()
     error_occurred = Signal(str)
-    refresh_requested = Signal()
-    system_notification = Signal(str, str, int)  # 添加紧急级别参数
+    refresh_requested = Signal(str)  # 需要全量同步的白板id（空字符串表示主白板）
+    item_upserted = Signal(str, dict)  # 类型, 数据
+    item_deleted = Signal(str, str, str, object)  # 类型, id, 白板id（空字符串表示未指明）, board_version
+    system_notification = Signal(str, str, int, str, str)  # 标题, 内容, 紧急级别, 去重键（条目类型:id）, 白板id
+    boards_joined = Signal(list)  # 当前连接上能收到推送的白板id
+    
+    # 优先直接走WebSocket；只支持长轮询的环境（如本地模拟服务器）可改成 ['polling']
+    transports = ['websocket', 'polling']
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.sio = None
         self.running = False
+        # 断开、停止或更换配置时唤醒run()循环
+        self.wake_event = threading.Event()
         self.base_url = ""
         self.board_id = ""
         self.secret_key = ""
+        # 复用同一连接的其他白板: [(board_id, secret_key)]，需要服务器支持 join_board
+        self.extra_boards = []
+        self.joined_boards = []
+        self.rejoin = False
+        # 等待回复超时的事件（join_board / resume），说明服务器不支持，换服务器之前不再调用
+        self.unsupported_events = set()
+        # 重连退避：1秒起步，翻倍到60秒封顶
+        self.base_delay = 1
+        self.max_delay = 60
+        self.failures = 0
+        # 每个白板最后收到的推送事件，重连时逐个交给服务器补发: board_id -> {'last_event_id', 'since'}
+        self.resume_positions = {}
         
     def setup(self, server, board_id, secret_key):
         self.board_id = board_id
@@ -60,282 +312,203 @@ class SocketIOClientThread(QThread):
         parsed_url = urlparse(server)
         self.base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
         
-        print(f"Socket.IO客户端已设置: {self.base_url}")
-        
-    def run(self):
-        if not SOCKETIO_AVAILABLE:
-            error_msg = "python-socketio不可用"
-            print(error_msg)
-            self.error_occurred.emit(error_msg)
+        socket_log.info("Socket.IO客户端已设置: %s", self.base_url)
+        
+    def reconfigure(self, server, board_id, secret_key, extra_boards=()):
+        # 配置变化时断开当前连接，由run()循环用新配置重连，不必重建线程
+        old = self.config()
+        extras_changed = list(extra_boards) != self.extra_boards
+        self.extra_boards = list(extra_boards)
+        self.setup(server, board_id, secret_key)
+        if self.base_url != old[0]:
+            self.unsupported_events = set()
+        if old == self.config() and self.is_connected():
+            if extras_changed:
+                # 只是增减了复用的白板，不用重连，让run()循环重新加入
+                self.rejoin = True
+                self.wake_event.set()
             return
             
-        self.running = True
-        
-        try:
-            self.sio = socketio.Client()
-            
-            self.sio.on('connect', self.on_connected)
-            self.sio.on('disconnect', self.on_disconnected)
-            self.sio.on('connect_error', self.on_connect_error)
-            self.sio.on('connected', self.on_server_connected)
-            self.sio.on('new_task', self.on_new_task)
-            self.sio.on('new_announcement', self.on_new_announcement)
-            self.sio.on('new_assignment', self.on_new_assignment)
-            self.sio.on('update_assignment', self.on_update_assignment)
-            self.sio.on('delete_task', self.on_delete_task)
-            self.sio.on('delete_announcement', self.on_delete_announcement)
-            self.sio.on('delete_assignment', self.on_delete_assignment)
-            
-            connect_url = f"{self.base_url}?board_id={self.board_id}&secret_key={self.secret_key}"
-            print(f"正在连接Socket.IO: {connect_url}")
-        
-            self.sio.connect(
-                connect_url,
-                transports=['websocket', 'polling'],
-                namespaces=['/']
-            )
-            
-            print("Socket.IO连接命令已发送，等待连接...")
-            
-            while self.running:
-                time.sleep(0.1)
-                
-        except Exception as e:
-            error_msg = f"Socket.IO运行异常: {str(e)}"
-            print(error_msg)
-            self.error_occurred.emit(error_msg)
-            
-    def on_connected(self):
-        print("=== Socket.IO连接已建立 ===")
-        self.connected.emit()
-        
-    def on_disconnected(self):
-        print("=== Socket.IO连接已断开 ===")
-        self.disconnected.emit()
-        
-    def on_connect_error(self, data):
-        error_msg = f"Socket.IO连接错误: {data}"
-        print(error_msg)
-        self.error_occurred.emit(error_msg)
-        
-    def on_server_connected(self, data):
-        print(f"【认证结果】状态：{data.get('status')} | 消息：{data.get('message')}")
-        
-    def on_new_task(self, task_data):
-        print(f"收到新任务: {task_data.get('title')}")
-        message = {
-            'type': 'new_task',
-            'data': task_data
-        }
-        self.message_received.emit(message)
-        self.refresh_requested.emit()
-        
-        action_id = task_data.get('action_id')
-        if action_id == 1:
-            title = "新任务通知"
-            content = f"紧急任务: {task_data.get('title', '无标题')}"
-            if task_data.get('description'):
-                content += f"\n{task_data.get('description')}"
-            
-            print(f"触发系统通知: {title} - {content}")
-            self.system_notification.emit(title, content, 1)  # 级别1：普通通知
-            
-        elif action_id == 2:
-            title = "系统警告"
-            content = f"重要系统通知: {task_data.get('title', '无标题')}"
-            if task_data.get('description'):
-                content += f"\n{task_data.get('description')}"
-            
-            print(f"触发系统级警告: {title} - {content}")
-            self.system_notification.emit(title, content, 3)  # 级别3：系统级警告（Windows弹窗）
-            
-    def on_new_announcement(self, announcement_data):
-        print(f"收到新公告: {announcement_data.get('title')}")
-        message = {
-            'type': 'new_announcement',
-            'data': announcement_data
-        }
-        self.message_received.emit(message)
-        self.refresh_requested.emit()
-        
-        # 检查是否需要系统级提醒
-        action_id = announcement_data.get('action_id')
-        if action_id == 2:
-            title = "重要公告"
-            content = f"系统公告: {announcement_data.get('title', '无标题')}"
-            if announcement_data.get('content'):
-                content += f"\n{announcement_data.get('content')}"
-            
-            print(f"触发系统级公告通知: {title} - {content}")
-            self.system_notification.emit(title, content, 3)  # 级别3：系统级警告
-            
-    def on_new_assignment(self, assignment_data):
-        print(f"收到新作业: {assignment_data.get('title')}")
-        message = {
-            'type': 'new_assignment',
-            'data': assignment_data
-        }
-        self.message_received.emit(message)
-        self.refresh_requested.emit()
-        
-        # 检查是否需要系统级提醒
-        action_id = assignment_data.get('action_id')
-        if action_id == 2:
-            title = "重要作业"
-            content = f"系统作业: {assignment_data.get('title', '无标题')}"
-            if assignment_data.get('description'):
-                content += f"\n{assignment_data.get('description')}"
-            
-            print(f"触发系统级作业通知: {title} - {content}")
-            self.system_notification.emit(title, content, 3)  # 级别3：系统级警告
-        
-    def on_update_assignment(self, assignment_data):
-        print(f"作业已更新: {assignment_data.get('title')}")
-        message = {
-            'type': 'assignment_updated',
-            'data': assignment_data
-        }
-        self.message_received.emit(message)
-        self.refresh_requested.emit()
-        
-    def on_delete_task(self, data):
-        task_id = data.get('task_id')
-        print(f"任务被删除: {task_id}")
-        message = {
-            'type': 'task_deleted',
-            'data': data
-        }
-        self.message_received.emit(message)
-        self.refresh_requested.emit()
-        
-    def on_delete_announcement(self, data):
-        print("公告被删除")
-        message = {
-            'type': 'announcement_deleted',
-            'data': data
-        }
-        self.message_received.emit(message)
-        self.refresh_requested.emit()
-        
-    def on_delete_assignment(self, data):
-        print("作业被删除")
-        message = {
-            'type': 'assignment_deleted',
-            'data': data
-        }
-        self.message_received.emit(message)
-        self.refresh_requested.emit()
-        
-    def send_heartbeat(self):
-        if self.sio and self.sio.connected:
-            heartbeat_data = {
-                "board_id": self.board_id
-            }
-            self.sio.emit('heartbeat', heartbeat_data)
-            print("发送Socket.IO心跳消息")
-        else:
-            print("Socket.IO未连接，无法发送心跳")
-        
-    def stop(self):
-        print("停止Socket.IO客户端")
-        self.running = False
-        if self.sio:
+        # 不再使用这个连接的白板，补发位置也不再需要
+        boards = {board_id} | {extra_id for extra_id, _ in self.extra_boards}
+        self.resume_positions = {key: value for key, value in self.resume_positions.items() if key in boards}
+        self.failures = 0
+        if self.is_connected():
             self.sio.disconnect()
-        self.wait(2000)
-    message_received = Signal(dict)
-    connected = Signal()
-    disconnected = Signal()
-    error_occurred = Signal(str)
-    refresh_requested = Signal()
-    system_notification = Signal(str, str, int)  # 添加紧急级别参数
-    
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.sio = None
-        self.running = False
-        self.base_url = ""
-        self.board_id = ""
-        self.secret_key = ""
-        
-    def setup(self, server, board_id, secret_key):
-        self.board_id = board_id
-        self.secret_key = secret_key
+        self.wake_event.set()
+        
+    def create_client(self):
+        # 重连由本线程控制，整个生命周期只用这一个Client
+        self.sio = socketio.Client(reconnection=False)
+        
+        handlers = {
+            'connect': self.on_connected,
+            'disconnect': self.on_disconnected,
+            'connect_error': self.on_connect_error,
+            'connected': self.on_server_connected,
+            'new_task': self.on_new_task,
+            'new_announcement': self.on_new_announcement,
+            'new_assignment': self.on_new_assignment,
+            'update_assignment': self.on_update_assignment,
+            'delete_task': self.on_delete_task,
+            'delete_announcement': self.on_delete_announcement,
+            'delete_assignment': self.on_delete_assignment
+        }
+        for event, handler in handlers.items():
+            self.sio.on(event, METRICS.timed(f"socket {event}")(handler))
         
-        if not server.startswith(('http://', 'https://')):
-            server = 'http://' + server
-            
-        parsed_url = urlparse(server)
-        self.base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+    def config(self):
+        return (self.base_url, self.board_id, self.secret_key)
         
-        print(f"Socket.IO客户端已设置: {self.base_url}")
+    def connect_url(self):
+        # 补发位置只通过 resume 调用传给服务器，避免服务器按连接参数和 resume 各补发一次
+        query = {'board_id': self.board_id, 'secret_key': self.secret_key}
+        return f"{self.base_url}?{urlencode(query)}"
         
     def run(self):
-        if not SOCKETIO_AVAILABLE:
+        if not socketio_available():
             error_msg = "python-socketio不可用"
-            print(error_msg)
+            socket_log.error(error_msg)
             self.error_occurred.emit(error_msg)
             return
             
         self.running = True
-        
-        try:
-            self.sio = socketio.Client()
-            
-            self.sio.on('connect', self.on_connected)
-            self.sio.on('disconnect', self.on_disconnected)
-            self.sio.on('connect_error', self.on_connect_error)
-            self.sio.on('connected', self.on_server_connected)
-            self.sio.on('new_task', self.on_new_task)
-            self.sio.on('new_announcement', self.on_new_announcement)
-            self.sio.on('new_assignment', self.on_new_assignment)
-            self.sio.on('update_assignment', self.on_update_assignment)
-            self.sio.on('delete_task', self.on_delete_task)
-            self.sio.on('delete_announcement', self.on_delete_announcement)
-            self.sio.on('delete_assignment', self.on_delete_assignment)
-            
-            connect_url = f"{self.base_url}?board_id={self.board_id}&secret_key={self.secret_key}"
-            print(f"正在连接Socket.IO: {connect_url}")
-        
-            self.sio.connect(
-                connect_url,
-                transports=['websocket', 'polling'],
-                namespaces=['/']
-            )
-            
-            print("Socket.IO连接命令已发送，等待连接...")
+        self.wake_event.clear()
+        if self.sio is None:
+            self.create_client()
             
-            while self.running:
-                time.sleep(0.1)
+        ever_connected = False
+        while self.running:
+            config = self.config()
+            try:
+                socket_log.info("正在连接Socket.IO: %s", self.base_url)
+                self.sio.connect(
+                    self.connect_url(),
+                    transports=self.transports,
+                    namespaces=['/']
+                )
+            except Exception as e:
+                if not self.running:
+                    break
+                self.failures += 1
+                error_msg = f"Socket.IO连接失败: {str(e)}"
+                socket_log.warning(error_msg)
+                # 连续失败只上报第一次，之后安静地退避重试
+                if self.failures == 1:
+                    self.error_occurred.emit(error_msg)
+                self.wait_before_retry()
+                continue
                 
+            self.failures = 0
+            if self.config() != config:
+                # 连接期间 reconfigure() 换了配置，这个连接不再使用
+                self.sio.disconnect()
+                continue
+            self.join_boards()
+            if ever_connected:
+                self.resume()
+            ever_connected = True
+                
+            # 事件由socketio自己的线程回调，这里阻塞到断开、stop()或配置变化；
+            # 加入白板、补发期间调用的 reconfigure() 也在这里发现，不必等到下次断开
+            while self.running and self.sio.connected and self.config() == config:
+                self.wake_event.wait()
+                self.wake_event.clear()
+                if self.rejoin and self.sio.connected:
+                    self.join_boards()
+            if self.sio.connected:
+                self.sio.disconnect()
+            if self.running and self.config() == config:
+                self.wait_before_retry()
+                
+    def join_boards(self):
+        # 主白板由连接参数认证，其余白板逐个请求加入；服务器不支持时这些白板只靠轮询
+        self.rejoin = False
+        joined = [self.board_id]
+        for board_id, secret_key in self.extra_boards:
+            reply = self.call_event('join_board', {'board_id': board_id, 'secret_key': secret_key})
+            if reply is None:
+                # 超时说明服务器没有这个事件，其余白板也不用再等
+                if 'join_board' in self.unsupported_events:
+                    break
+                continue
+            if isinstance(reply, dict) and reply.get('status') == 'ok':
+                joined.append(board_id)
+            else:
+                socket_log.info("白板%s无法复用连接: %s", board_id, reply)
+        self.joined_boards = joined
+        self.boards_joined.emit(joined)
+        
+    def retry_delay(self):
+        # 指数退避加随机抖动，避免大量白板在服务器恢复时同时重连
+        delay = min(self.max_delay, self.base_delay * 2 ** max(self.failures - 1, 0))
+        return random.uniform(delay / 2, delay)
+        
+    def wait_before_retry(self):
+        delay = self.retry_delay()
+        socket_log.info("Socket.IO将在%.1f秒后重连", delay)
+        self.wake_event.wait(delay)
+        self.wake_event.clear()
+        
+    def resume(self):
+        # 连接上的每个白板各自带上最后收到的事件请服务器补发，没有确认补发的白板单独全量同步
+        for board_id in self.joined_boards:
+            position = self.resume_positions.get(board_id)
+            reply = None
+            if position:
+                reply = self.call_event('resume', dict(position, board_id=board_id))
+            if isinstance(reply, dict) and reply.get('status') == 'ok':
+                socket_log.info("服务器为白板%s补发了%s个事件", board_id, reply.get('replayed', 0))
+            else:
+                socket_log.info("白板%s无法补发漏掉的事件，执行全量同步", board_id)
+                self.refresh_requested.emit('' if board_id == self.board_id else board_id)
+            
+    def call_event(self, event, payload, timeout=5):
+        # 阻塞等待服务器回复；失败返回 None，超时的事件记为不支持，之后直接跳过
+        if event in self.unsupported_events:
+            return None
+        try:
+            return self.sio.call(event, payload, timeout=timeout)
+        except socketio.exceptions.TimeoutError:
+            socket_log.info("服务器不支持%s，之后不再调用", event)
+            self.unsupported_events.add(event)
         except Exception as e:
-            error_msg = f"Socket.IO运行异常: {str(e)}"
-            print(error_msg)
-            self.error_occurred.emit(error_msg)
+            socket_log.info("%s调用失败: %s", event, e)
+        return None
+        
+    def mark_event(self, data):
+        if not isinstance(data, dict):
+            return
+        position = self.resume_positions.setdefault(self.board_of(data) or self.board_id,
+                                                    {'last_event_id': None, 'since': None})
+        if data.get('event_id') is not None:
+            position['last_event_id'] = data.get('event_id')
+        position['since'] = data.get('event_time', time.time())
             
     def on_connected(self):
-        print("=== Socket.IO连接已建立 ===")
+        socket_log.info("Socket.IO连接已建立")
         self.connected.emit()
         
-    def on_disconnected(self):
-        print("=== Socket.IO连接已断开 ===")
+    def on_disconnected(self, reason=None):
+        socket_log.info("Socket.IO连接已断开")
         self.disconnected.emit()
+        self.wake_event.set()
         
     def on_connect_error(self, data):
-        error_msg = f"Socket.IO连接错误: {data}"
-        print(error_msg)
-        self.error_occurred.emit(error_msg)
+        socket_log.warning("Socket.IO连接错误: %s", data)
         
     def on_server_connected(self, data):
-        print(f"【认证结果】状态：{data.get('status')} | 消息：{data.get('message')}")
+        socket_log.info("认证结果: 状态=%s 消息=%s", data.get('status'), data.get('message'))
         
     def on_new_task(self, task_data):
-        print(f"收到新任务: {task_data.get('title')}")
+        self.mark_event(task_data)
+        socket_log.debug("收到新任务: %s", task_data.get('title'))
         message = {
             'type': 'new_task',
             'data': task_data
         }
         self.message_received.emit(message)
-        self.refresh_requested.emit()
+        self.item_upserted.emit('task', task_data)
         
         action_id = task_data.get('action_id')
         if action_id == 1:
@@ -344,8 +517,8 @@ class SocketIOClientThread(QThread):
             if task_data.get('description'):
                 content += f"\n{task_data.get('description')}"
             
-            print(f"触发系统通知: {title} - {content}")
-            self.system_notification.emit(title, content, 1)  # 级别1：普通通知
+            socket_log.debug("触发系统通知: %s - %s", title, content)
+            self.system_notification.emit(title, content, 1, self.notification_key('task', task_data), self.board_of(task_data))  # 级别1：普通通知
             
         elif action_id == 2:
             title = "系统警告"
@@ -353,17 +526,18 @@ class SocketIOClientThread(QThread):
             if task_data.get('description'):
                 content += f"\n{task_data.get('description')}"
             
-            print(f"触发系统级警告: {title} - {content}")
-            self.system_notification.emit(title, content, 3)  # 级别3：系统级警告
+            socket_log.debug("触发系统级警告: %s - %s", title, content)
+            self.system_notification.emit(title, content, 3, self.notification_key('task', task_data), self.board_of(task_data))  # 级别3：系统级警告
             
     def on_new_announcement(self, announcement_data):
-        print(f"收到新公告: {announcement_data.get('title')}")
+        self.mark_event(announcement_data)
+        socket_log.debug("收到新公告: %s", announcement_data.get('title'))
         message = {
             'type': 'new_announcement',
             'data': announcement_data
         }
         self.message_received.emit(message)
-        self.refresh_requested.emit()
+        self.item_upserted.emit('announcement', announcement_data)
         
         # 检查是否需要系统级提醒
         action_id = announcement_data.get('action_id')
@@ -373,17 +547,18 @@ class SocketIOClientThread(QThread):
             if announcement_data.get('content'):
                 content += f"\n{announcement_data.get('content')}"
             
-            print(f"触发系统级公告通知: {title} - {content}")
-            self.system_notification.emit(title, content, 3)  # 级别3：系统级警告
+            socket_log.debug("触发系统级公告通知: %s - %s", title, content)
+            self.system_notification.emit(title, content, 3, self.notification_key('announcement', announcement_data), self.board_of(announcement_data))  # 级别3：系统级警告
             
     def on_new_assignment(self, assignment_data):
-        print(f"收到新作业: {assignment_data.get('title')}")
+        self.mark_event(assignment_data)
+        socket_log.debug("收到新作业: %s", assignment_data.get('title'))
         message = {
             'type': 'new_assignment',
             'data': assignment_data
         }
         self.message_received.emit(message)
-        self.refresh_requested.emit()
+        self.item_upserted.emit('assignment', assignment_data)
         
         # 检查是否需要系统级提醒
         action_id = assignment_data.get('action_id')
@@ -393,70 +568,137 @@ class SocketIOClientThread(QThread):
             if assignment_data.get('description'):
                 content += f"\n{assignment_data.get('description')}"
             
-            print(f"触发系统级作业通知: {title} - {content}")
-            self.system_notification.emit(title, content, 3)  # 级别3：系统级警告
+            socket_log.debug("触发系统级作业通知: %s - %s", title, content)
+            self.system_notification.emit(title, content, 3, self.notification_key('assignment', assignment_data), self.board_of(assignment_data))  # 级别3：系统级警告
         
     def on_update_assignment(self, assignment_data):
-        print(f"作业已更新: {assignment_data.get('title')}")
+        self.mark_event(assignment_data)
+        socket_log.debug("作业已更新: %s", assignment_data.get('title'))
         message = {
             'type': 'assignment_updated',
             'data': assignment_data
         }
         self.message_received.emit(message)
-        self.refresh_requested.emit()
+        self.item_upserted.emit('assignment', assignment_data)
         
     def on_delete_task(self, data):
-        task_id = data.get('task_id')
-        print(f"任务被删除: {task_id}")
+        self.mark_event(data)
+        task_id = data.get('task_id', data.get('id'))
+        socket_log.debug("任务被删除: %s", task_id)
         message = {
             'type': 'task_deleted',
             'data': data
         }
         self.message_received.emit(message)
-        self.refresh_requested.emit()
+        self.emit_deleted('task', task_id, data)
         
     def on_delete_announcement(self, data):
-        print("公告被删除")
+        self.mark_event(data)
+        socket_log.debug("公告被删除")
         message = {
             'type': 'announcement_deleted',
             'data': data
         }
         self.message_received.emit(message)
-        self.refresh_requested.emit()
+        self.emit_deleted('announcement', data.get('announcement_id', data.get('id')), data)
         
     def on_delete_assignment(self, data):
-        print("作业被删除")
+        self.mark_event(data)
+        socket_log.debug("作业被删除")
         message = {
             'type': 'assignment_deleted',
             'data': data
         }
         self.message_received.emit(message)
-        self.refresh_requested.emit()
+        self.emit_deleted('assignment', data.get('assignment_id', data.get('id')), data)
         
-    def send_heartbeat(self):
-        if self.sio and self.sio.connected:
+    @staticmethod
+    def notification_key(item_type, data):
+        # 同一条目的重复提醒按这个键合并，没有id时按标题和内容合并
+        item_id = data.get('id')
+        return "" if item_id is None else f"{item_type}:{item_id}"
+        
+    @staticmethod
+    def board_of(data):
+        # 事件所属的白板，空字符串表示连接参数里的主白板
+        return str(data.get('board_id') or '')
+        
+    def emit_deleted(self, item_type, item_id, data):
+        # 删除事件里没有id时无法定位，只能全量同步
+        if item_id is None:
+            self.refresh_requested.emit(self.board_of(data))
+        else:
+            self.item_deleted.emit(item_type, str(item_id), self.board_of(data), data.get('board_version'))
+        
+    def is_connected(self, board_id=None):
+        # 指定白板时还要求它已经加入这个连接
+        if not (self.sio and self.sio.connected):
+            return False
+        return board_id is None or board_id in self.joined_boards
+        
+    def send_heartbeat(self, board_id=None):
+        if self.is_connected():
             heartbeat_data = {
-                "board_id": self.board_id
+                "board_id": board_id or self.board_id
             }
             self.sio.emit('heartbeat', heartbeat_data)
-            print("发送Socket.IO心跳消息")
+            socket_log.debug("发送Socket.IO心跳消息")
         else:
-            print("Socket.IO未连接，无法发送心跳")
+            socket_log.debug("Socket.IO未连接，无法发送心跳")
         
     def stop(self):
-        print("停止Socket.IO客户端")
+        socket_log.info("停止Socket.IO客户端")
         self.running = False
+        self.wake_event.set()
         if self.sio:
             self.sio.disconnect()
-        self.wait(2000)
+        if not self.wait(2000):
+            # 多半卡在连接握手里，线程对象仍由 BoardHub 持有，不会在运行中被销毁
+            socket_log.warning("Socket.IO线程2秒内没有退出，继续在后台结束")
 
 class WhiteboardClientAPI:
-    def __init__(self):
+    def __init__(self, pool_size=4, connect_timeout=5, read_timeout=10, session_source=None):
         self.headers = {}
         self.base_url = ""
         self.board_id = ""
         self.secret_key = ""
         self.connected = False
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        # 第一次请求时才创建，避免启动时就导入requests
+        self.session = None
+        self.session_lock = threading.Lock()
+        # 多个白板共用 session_source 的连接池，认证头按请求单独带
+        self.session_source = session_source
+        # 条件请求缓存: (路径, 参数) -> ETag / Last-Modified / 内容摘要 / 上次结果
+        self.validators = {}
+        # 服务器最近一次在响应头里确认"这次请求同时算心跳"的时间；服务器不支持时一直为0，照常发心跳
+        self.heartbeat_ack_time = 0
+        # 响应体超过这个大小时边下载边解析，先把已解析的条目交给界面
+        self.stream_min_bytes = 256 * 1024
+        self.stream_chunk_size = 64 * 1024
+        self.stream_first_batch = 200
+        # 下载超过这个时间还没结束才改为增量解析
+        self.stream_after = 0.2
+        
+    def create_session(self):
+        # 复用长连接，避免每次轮询/心跳都重新做TCP+TLS握手
+        requests = load_requests()
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+        
+    def get_session(self):
+        # 请求可能同时从多个工作线程发出，只创建一次
+        if self.session_source is not None:
+            return self.session_source.get_session()
+        if self.session is None:
+            with self.session_lock:
+                if self.session is None:
+                    self.session = self.create_session()
+        return self.session
         
     def setup(self, server, board_id, secret_key):
         self.board_id = board_id
@@ -470,34 +712,159 @@ class WhiteboardClientAPI:
         
         self.headers = {
             'X-Board-ID': board_id,
-            'X-Secret-Key': secret_key
+            'X-Secret-Key': secret_key,
+            # 告知服务器这次请求同时代表白板在线，可省去单独的心跳请求
+            'X-Board-Heartbeat': '1'
+        }
+        self.validators = {}
+        
+        api_log.info("API客户端已设置: %s, Board ID: %s", self.base_url, board_id)
+        
+    def set_timeouts(self, connect_timeout, read_timeout):
+        self.timeout = (connect_timeout, read_timeout)
+        
+    def connection_stats(self):
+        # 新建连接数和复用次数，用来确认握手是否真的省掉了
+        new_connections = 0
+        requests_sent = 0
+        if self.session_source is not None:
+            return self.session_source.connection_stats()
+        if self.session is None:
+            return {"new": 0, "reused": 0, "requests": 0}
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                new_connections += pool.num_connections
+                requests_sent += pool.num_requests
+        return {
+            "new": new_connections,
+            "reused": max(requests_sent - new_connections, 0),
+            "requests": requests_sent
         }
         
-        print(f"API客户端已设置: {self.base_url}, Board ID: {board_id}")
+    def request(self, method, path, params=None, timeout=None, conditional=False, records=False, on_partial=None,
+                body=None):
+        start = time.perf_counter()
+        result = self.send_request(method, path, params, timeout, conditional, records, on_partial, body)
+        # 路径里的任务id归一化，避免每个任务单独成一项指标
+        name = "http {} {}".format(method, re.sub(r'/\d+', '/<id>', path))
+        METRICS.record(name, (time.perf_counter() - start) * 1000, bool(result.get('success')))
+        # 连接复用情况随请求更新，在诊断信息里和耗时一起查看
+        stats = self.connection_stats()
+        METRICS.gauge("http connections new", stats["new"])
+        METRICS.gauge("http connections reused", stats["reused"])
+        return result
+        
+    def send_request(self, method, path, params=None, timeout=None, conditional=False, records=False, on_partial=None,
+                     body=None):
+        # records: 响应里的 data 直接转成条目记录，在工作线程里完成
+        decode = decode_board_payload if records else decode_json
+        headers = self.headers
+        cache_key = None
+        cached = None
+        if conditional:
+            cache_key = (path, tuple(sorted((params or {}).items())))
+            cached = self.validators.get(cache_key)
+            if cached:
+                headers = dict(self.headers)
+                if cached['etag']:
+                    headers['If-None-Match'] = cached['etag']
+                if cached['last_modified']:
+                    headers['If-Modified-Since'] = cached['last_modified']
+                    
+        # 只有第一次拉取（没有缓存可比较）时才边下载边显示，之后仍按内容摘要跳过未变化的响应
+        stream = bool(on_partial and records and conditional and not cached)
+        try:
+            # 边下载边解析或出错时响应体可能没读完，用完必须关闭，连接才会回到连接池
+            with self.get_session().request(
+                method,
+                f"{self.base_url}{path}",
+                headers=headers,
+                params=params,
+                json=body,
+                timeout=timeout or self.timeout,
+                stream=stream
+            ) as response:
+                if response.status_code in (200, 304) and response.headers.get('X-Board-Heartbeat'):
+                    self.heartbeat_ack_time = time.time()
+                
+                if cached and response.status_code == 304:
+                    return self.not_modified_result(cached)
+                
+                if response.status_code == 200:
+                    if not conditional:
+                        return decode(response.content)
+                    
+                    length = response.headers.get('Content-Length')
+                    if stream and (not length or int(length) >= self.stream_min_bytes):
+                        result, digest = self.stream_records(response, on_partial)
+                    else:
+                        # 服务器不支持校验头时，用内容摘要判断是否变化，未变化就不再解析
+                        digest = hashlib.sha1(response.content).hexdigest()
+                        if cached and cached['digest'] == digest:
+                            return self.not_modified_result(cached)
+                        result = decode(response.content)
+                    
+                    if result.get('success'):
+                        self.validators[cache_key] = {
+                            'etag': response.headers.get('ETag'),
+                            'last_modified': response.headers.get('Last-Modified'),
+                            'digest': digest,
+                            'result': result
+                        }
+                    return result
+                else:
+                    # 带上状态码，调用方据此区分可重试的错误
+                    return {"success": False, "error": f"HTTP错误: {response.status_code}", "status": response.status_code}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+            
+    def stream_records(self, response, on_partial):
+        # 增量解析器逐条解析，比整体交给最快的JSON后端慢（5000条约33ms对18ms），只在下载慢时才值得：
+        # 先攒着数据块，下载在 stream_after 秒内结束就整体解码；超过后才切到增量解析，
+        # 边下载边交出条目，第一批凑够少量条目就交出去，之后每批翻倍，界面只重建对数次
+        digest = hashlib.sha1()
+        chunks = []
+        parser = None
+        pending = []
+        emitted = 0
+        started = time.perf_counter()
+        for chunk in response.iter_content(chunk_size=self.stream_chunk_size):
+            digest.update(chunk)
+            if parser is None:
+                chunks.append(chunk)
+                if time.perf_counter() - started < self.stream_after:
+                    continue
+                parser = ItemStreamParser()
+                chunk = b"".join(chunks)
+                chunks = []
+            pending.extend(parser.feed(chunk))
+            if pending and len(pending) >= max(self.stream_first_batch, emitted):
+                on_partial(pending)
+                emitted += len(pending)
+                pending = []
+        if parser is None:
+            return decode_board_payload(b"".join(chunks)), digest.hexdigest()
+        return parser.close(), digest.hexdigest()
+            
+    def not_modified_result(self, cached):
+        result = dict(cached['result'])
+        result['not_modified'] = True
+        return result
 
-    def get_assignments(self, date=None, subject=None):
+    def get_assignments(self, date=None, subject=None, timeout=None):
         params = {}
         if date:
             params['date'] = date
         if subject:
             params['subject'] = subject
             
-        try:
-            response = requests.get(
-                f"{self.base_url}/api/whiteboard/assignments",
-                headers=self.headers,
-                params=params,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {"success": False, "error": f"HTTP错误: {response.status_code}"}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        return self.request('GET', "/api/whiteboard/assignments", params, timeout)
     
-    def get_tasks(self, date=None, priority=None, status=None):
+    def get_tasks(self, date=None, priority=None, status=None, timeout=None):
         params = {}
         if date:
             params['date'] = date
@@ -506,321 +873,1480 @@ class WhiteboardClientAPI:
         if status:
             params['status'] = status
             
-        try:
-            response = requests.get(
-                f"{self.base_url}/api/whiteboard/tasks",
-                headers=self.headers,
-                params=params,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {"success": False, "error": f"HTTP错误: {response.status_code}"}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        return self.request('GET', "/api/whiteboard/tasks", params, timeout)
     
-    def get_announcements(self, date=None, long_term=None):
+    def get_announcements(self, date=None, long_term=None, timeout=None):
         params = {}
         if date:
             params['date'] = date
         if long_term is not None:
             params['long_term'] = str(long_term).lower()
             
-        try:
-            response = requests.get(
-                f"{self.base_url}/api/whiteboard/announcements",
-                headers=self.headers,
-                params=params,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {"success": False, "error": f"HTTP错误: {response.status_code}"}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        return self.request('GET', "/api/whiteboard/announcements", params, timeout)
     
-    def get_all_data(self, date=None):
+    def get_all_data(self, date=None, timeout=None, on_partial=None):
+        # on_partial(条目记录列表)：响应较大时在下载途中被多次调用
         params = {}
         if date:
             params['date'] = date
             
+        return self.request('GET', "/api/whiteboard/all", params, timeout, conditional=True,
+                            records=True, on_partial=on_partial)
+    
+    def acknowledge_task(self, task_id, timeout=None):
+        return self.request('POST', f"/api/whiteboard/tasks/{task_id}/acknowledge", timeout=timeout)
+    
+    def complete_task(self, task_id, timeout=None):
+        return self.request('POST', f"/api/whiteboard/tasks/{task_id}/complete", timeout=timeout)
+    
+    def batch_task_actions(self, actions, timeout=None):
+        # actions: [{'task_id': ..., 'action': 'acknowledge' | 'complete'}]；服务器没有此接口时返回404
+        return self.request('POST', "/api/whiteboard/tasks/batch", timeout=timeout, body={'actions': actions})
+    
+    def send_heartbeat(self, timeout=None):
+        return self.request('POST', "/api/whiteboard/heartbeat", timeout=timeout)
+
+# 本地数据存储：按 (类型, id) 索引，Socket.IO推送直接增删改，不再每次全量拉取
+class BoardStore:
+    def __init__(self):
+        self.items = {}
+        # 服务器如果在数据中带 board_version，就用它检测漏掉的事件
+        self.version = None
+        # 上次全量同步后是否在本地改动过（推送增量或乐观更新）
+        self.dirty = False
+        
+    @staticmethod
+    def make_key(item_type, item_id):
+        return (item_type, str(item_id))
+        
+    def replace_all(self, data, version=None):
+        self.items = {}
+        for item in data:
+            item = make_item(item)
+            self.items[self.make_key(item.kind, item.id)] = item
+        self.version = version
+        self.dirty = False
+        
+    def check_version(self, version):
+        # 返回 False 表示版本不连续，需要全量同步
+        if version is None:
+            return True
         try:
-            response = requests.get(
-                f"{self.base_url}/api/whiteboard/all",
-                headers=self.headers,
-                params=params,
-                timeout=10
-            )
+            version = int(version)
+        except (TypeError, ValueError):
+            return True
             
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {"success": False, "error": f"HTTP错误: {response.status_code}"}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        if self.version is not None and version > self.version + 1:
+            return False
+        if self.version is None or version > self.version:
+            self.version = version
+        return True
+        
+    def upsert(self, item_type, item):
+        key = self.make_key(item_type, item.get('id'))
+        existing = self.items.get(key)
+        patch = dict(item, type=item_type)
+        self.items[key] = existing.merged(patch) if existing else make_item(patch)
+        self.dirty = True
+        
+    def remove(self, item_type, item_id):
+        removed = self.items.pop(self.make_key(item_type, item_id), None) is not None
+        if removed:
+            self.dirty = True
+        return removed
+        
+    def get(self, item_type, item_id):
+        return self.items.get(self.make_key(item_type, item_id))
+        
+    def restore(self, item_type, item_id, item):
+        self.items[self.make_key(item_type, item_id)] = item
+        self.dirty = True
+        
+    def snapshot(self):
+        return list(self.items.values())
+
+# 服务器时间字符串解析成时间戳，同一个字符串只解析一次；格式不对时返回 None
+@functools.lru_cache(maxsize=4096)
+def parse_board_time(text):
+    if not text:
+        return None
+    try:
+        return datetime.strptime(text, "%Y-%m-%d %H:%M:%S").timestamp()
+    except (TypeError, ValueError):
+        return None
+
+PRIORITY_TEXT = {1: "低", 2: "中", 3: "高"}
+
+def priority_text(priority):
+    return PRIORITY_TEXT.get(priority, "未知")
+
+class Priority(enum.IntEnum):
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
     
-    def acknowledge_task(self, task_id):
+    @classmethod
+    def parse(cls, value):
+        # 缺省为低优先级，无法识别的值为 None（显示为“未知”）；原始值另外保存在记录里，序列化时原样写回
+        if value is None:
+            return cls.LOW
         try:
-            response = requests.post(
-                f"{self.base_url}/api/whiteboard/tasks/{task_id}/acknowledge",
-                headers=self.headers,
-                timeout=10
-            )
+            return cls(int(value))
+        except (TypeError, ValueError):
+            return None
+
+# 条目记录：入库时由JSON字典构建一次，日期预先解析成时间戳。
+# 记录创建后不再修改，有变化时整条替换，所以可以放心地在线程和信号间传递。
+# 日期和优先级同时保留服务器给的原始值，合并增量和写本地缓存时原样写回，格式不认识的值也不会丢
+class BoardItem:
+    __slots__ = ('kind', 'id', 'title', 'due_date', 'created_at', 'due_ts', 'created_ts')
+    # 参与比较和序列化的字段，子类追加自己的字段
+    FIELDS = ('id', 'title', 'due_date', 'created_at')
+    # 为 None 时不写进字典的字段
+    OPTIONAL = ('due_date', 'created_at')
+    
+    def __init__(self, data):
+        self.kind = data.get('type')
+        self.id = data.get('id')
+        self.title = data.get('title', '无标题')
+        self.due_date = data.get('due_date')
+        self.created_at = data.get('created_at')
+        self.due_ts = parse_board_time(self.due_date)
+        self.created_ts = parse_board_time(self.created_at)
+        
+    @property
+    def key(self):
+        return str(self.id)
+        
+    def to_dict(self):
+        data = {}
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if value is not None or name not in self.OPTIONAL:
+                data[name] = value
+        data['type'] = self.kind
+        return data
+        
+    def merged(self, patch):
+        # 推送的增量只带部分字段，合并后生成新记录
+        data = self.to_dict()
+        data.update(patch)
+        return make_item(data)
+        
+    def values(self):
+        return (self.kind,) + tuple(getattr(self, name) for name in self.FIELDS)
+        
+    def __eq__(self, other):
+        return isinstance(other, BoardItem) and self.values() == other.values()
+        
+    def __ne__(self, other):
+        return not self == other
+        
+    __hash__ = None
+
+class TaskItem(BoardItem):
+    __slots__ = ('description', 'priority', 'raw_priority', 'is_acknowledged', 'is_completed')
+    FIELDS = BoardItem.FIELDS + ('description', 'raw_priority', 'is_acknowledged', 'is_completed')
+    
+    def __init__(self, data):
+        super().__init__(data)
+        self.description = data.get('description', '无描述')
+        self.raw_priority = data.get('priority')
+        self.priority = Priority.parse(self.raw_priority)
+        self.is_acknowledged = bool(data.get('is_acknowledged', False))
+        self.is_completed = bool(data.get('is_completed', False))
+        
+    def to_dict(self):
+        data = super().to_dict()
+        raw_priority = data.pop('raw_priority')
+        if raw_priority is not None:
+            data['priority'] = raw_priority
+        return data
+
+class AssignmentItem(BoardItem):
+    __slots__ = ('subject', 'description')
+    FIELDS = BoardItem.FIELDS + __slots__
+    
+    def __init__(self, data):
+        super().__init__(data)
+        self.subject = data.get('subject', '无科目')
+        self.description = data.get('description', '无描述')
+
+class AnnouncementItem(BoardItem):
+    __slots__ = ('content', 'is_long_term')
+    FIELDS = BoardItem.FIELDS + __slots__
+    
+    def __init__(self, data):
+        super().__init__(data)
+        self.content = data.get('content', '无内容')
+        self.is_long_term = bool(data.get('is_long_term', False))
+
+ITEM_TYPES = {
+    'task': TaskItem,
+    'assignment': AssignmentItem,
+    'announcement': AnnouncementItem
+}
+
+def make_item(data):
+    # 已经是记录时原样返回；未知类型的条目只保留通用字段
+    if isinstance(data, BoardItem):
+        return data
+    return ITEM_TYPES.get(data.get('type'), BoardItem)(data)
+
+def decode_board_payload(body, loads=None):
+    # 解码 /api/whiteboard/all 的响应，data 里的条目直接转成记录
+    result = (loads or decode_json)(body)
+    if isinstance(result, dict) and isinstance(result.get('data'), list):
+        result['data'] = [make_item(item) for item in result['data'] if isinstance(item, dict)]
+    return result
+
+# 增量解析 {"success": ..., "data": [{...}, ...], ...}：按块喂入字节，
+# data 数组里的条目一完整就转成记录返回，其余顶层字段在 close() 时一起返回
+class ItemStreamParser:
+    WHITESPACE = ' \t\n\r'
+    DELIMITERS = ',]}' + WHITESPACE
+    
+    def __init__(self):
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ""
+        self.pos = 0
+        self.state = 'start'
+        self.key = None
+        self.result = {}
+        self.items = []
+        
+    def feed(self, chunk, final=False):
+        self.buffer += self.text_decoder.decode(chunk, final)
+        new_items = []
+        self.parse(new_items, final)
+        # 已解析的部分丢掉，缓冲区里只留下未完整的一段
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+        self.items.extend(new_items)
+        return new_items
+        
+    def close(self):
+        self.feed(b"", final=True)
+        if self.state != 'done':
+            raise ValueError("响应数据不完整")
+        self.result['data'] = self.items
+        return self.result
+        
+    def decode_value(self, final):
+        # 返回 (值, True)；数据还不完整时返回 (None, False)
+        try:
+            value, end = self.decoder.raw_decode(self.buffer, self.pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None, False
+        # 数字后面还没收到分隔符时可能只收到一半（如 "-15" 后面还有 "00.5"）
+        if not final and isinstance(value, (int, float)) and not isinstance(value, bool) \
+                and (end == len(self.buffer) or self.buffer[end] not in self.DELIMITERS):
+            return None, False
+        self.pos = end
+        return value, True
+        
+    def parse(self, new_items, final):
+        buffer = self.buffer
+        while True:
+            while self.pos < len(buffer) and buffer[self.pos] in self.WHITESPACE:
+                self.pos += 1
+            if self.pos >= len(buffer) or self.state == 'done':
+                return
+            char = buffer[self.pos]
             
-            if response.status_code == 200:
-                return response.json()
+            if self.state == 'start':
+                if char != '{':
+                    raise ValueError("响应不是JSON对象")
+                self.pos += 1
+                self.state = 'key'
+            elif self.state == 'key':
+                if char == '}':
+                    self.pos += 1
+                    self.state = 'done'
+                elif char == ',':
+                    self.pos += 1
+                else:
+                    key, complete = self.decode_value(final)
+                    if not complete:
+                        return
+                    self.key = key
+                    self.state = 'colon'
+            elif self.state == 'colon':
+                if char != ':':
+                    raise ValueError("响应JSON格式错误")
+                self.pos += 1
+                self.state = 'items' if self.key == 'data' else 'value'
+            elif self.state == 'items':
+                if char != '[':
+                    # data 不是数组时按普通字段处理
+                    self.state = 'value'
+                    continue
+                self.pos += 1
+                self.state = 'item'
+            elif self.state == 'item':
+                if char == ']':
+                    self.pos += 1
+                    self.state = 'key'
+                elif char == ',':
+                    self.pos += 1
+                else:
+                    item, complete = self.decode_value(final)
+                    if not complete:
+                        return
+                    if isinstance(item, dict):
+                        new_items.append(make_item(item))
             else:
-                return {"success": False, "error": f"HTTP错误: {response.status_code}"}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+                value, complete = self.decode_value(final)
+                if not complete:
+                    return
+                self.result[self.key] = value
+                self.state = 'key'
+
+# 按窗口划分的条目索引：每次数据变化只分区一遍，并找出每个分区里变化的条目
+class BoardIndex:
+    PARTITIONS = ('task', 'assignment', 'announcement')
     
-    def complete_task(self, task_id):
+    def __init__(self):
+        # 分区名 -> {条目id: 条目}，保持数据原有顺序
+        self.partitions = {name: {} for name in self.PARTITIONS}
+        # 分区内最早到期的公告的到期时间
+        self.expires_at = None
+        
+    @staticmethod
+    def partition_of(item, now):
+        # 已完成的任务和已过期的公告不属于任何分区
+        item_type = item.kind
+        if item_type == 'task':
+            return None if item.is_completed else 'task'
+        if item_type == 'assignment':
+            return 'assignment'
+        if item_type == 'announcement':
+            until = BoardIndex.expiry_of(item)
+            return 'announcement' if until is None or until >= now else None
+        return None
+        
+    @staticmethod
+    def expiry_of(item):
+        # 长期公告和没有或无法解析截止时间的公告不会过期
+        if item.kind != 'announcement' or item.is_long_term:
+            return None
+        return item.due_ts
+        
+    def update(self, items, now):
+        # 返回 {分区名: 变化的条目id}，只包含内容或顺序有变化的分区
+        partitions = {name: {} for name in self.PARTITIONS}
+        expires_at = None
+        for item in items:
+            name = self.partition_of(item, now)
+            if name is None:
+                continue
+            partitions[name][item.key] = item
+            until = self.expiry_of(item)
+            if until is not None and (expires_at is None or until < expires_at):
+                expires_at = until
+                
+        changes = {}
+        for name, new in partitions.items():
+            old = self.partitions[name]
+            changed = {key for key, item in new.items() if old.get(key) is not item and old.get(key) != item}
+            changed.update(key for key in old if key not in new)
+            if changed or list(old) != list(new):
+                changes[name] = changed
+        self.partitions = partitions
+        self.expires_at = expires_at
+        return changes
+        
+    def items(self, name):
+        return list(self.partitions[name].values())
+
+# 把最后一次的白板状态存到本地，启动时先显示它，服务器连不上时也不会空白
+class SnapshotCache:
+    FORMAT = 1
+    
+    def __init__(self, path=None):
+        # 指定path时所有白板共用这一个文件，否则每个白板一个文件
+        self.path = path
+        self.folder = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation) or "."
+        self.last_digest = {}
+        self.lock = threading.Lock()
+        
+    def path_for(self, board_id):
+        if self.path:
+            return self.path
+        return os.path.join(self.folder, "board_snapshot_{}.json".format(re.sub(r'[^\w-]', '_', str(board_id))))
+        
+    def load(self, board_id):
         try:
-            response = requests.post(
-                f"{self.base_url}/api/whiteboard/tasks/{task_id}/complete",
-                headers=self.headers,
-                timeout=10
-            )
+            with open(self.path_for(board_id), 'rb') as f:
+                snapshot = json.loads(f.read())
+        except (OSError, ValueError):
+            return None
             
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {"success": False, "error": f"HTTP错误: {response.status_code}"}
+        # 换了白板或者文件格式不对就不用
+        if not isinstance(snapshot, dict) or snapshot.get('format') != self.FORMAT:
+            return None
+        if snapshot.get('board_id') != board_id or not isinstance(snapshot.get('items'), list):
+            return None
+            
+        self.last_digest[board_id] = self.content_digest(board_id, snapshot.get('version'), snapshot['items'])
+        return snapshot
+        
+    @staticmethod
+    def content_digest(board_id, version, items):
+        # saved_at 每次都不同，判断内容是否变化时不算它
+        return hashlib.sha1(json.dumps([board_id, version, items], sort_keys=True,
+                                       default=str).encode('utf-8')).hexdigest()
+        
+    def save(self, board_id, items, version):
+        raw = json.dumps({
+            'format': self.FORMAT,
+            'board_id': board_id,
+            'version': version,
+            'saved_at': time.time(),
+            'items': items
+        }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        digest = self.content_digest(board_id, version, items)
+        
+        with self.lock:
+            if digest == self.last_digest.get(board_id):
+                return False
+                
+            # 先写临时文件再替换，写到一半断电也不会留下损坏的缓存
+            path = self.path_for(board_id)
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            temp_path = path + ".tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(raw)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+            self.last_digest[board_id] = digest
+        return True
+
+# 后台执行API请求，结果通过信号回到GUI线程，避免网络慢时卡住界面
+class ApiTaskSignals(QObject):
+    finished = Signal(object)
+    progress = Signal(object)
+
+class ApiTask(QRunnable):
+    def __init__(self, fn, args, kwargs=None):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.signals = ApiTaskSignals()
+        
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
         except Exception as e:
-            return {"success": False, "error": str(e)}
+            result = {"success": False, "error": str(e)}
+        self.signals.finished.emit(result)
+
+class ApiExecutor(QObject):
+    def __init__(self, max_workers=4, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_workers)
+        self.pending = set()
+        
+    def submit(self, fn, *args, callback=None, progress=None):
+        # 给了 progress 时，fn 通过 on_partial 参数在执行途中把部分结果送回GUI线程
+        task = ApiTask(fn, args)
+        if progress:
+            task.kwargs['on_partial'] = task.signals.progress.emit
+            task.signals.progress.connect(progress)
+        # 持有引用直到回调执行完，防止信号对象被提前回收
+        self.pending.add(task)
+        task.signals.finished.connect(lambda result: self.on_task_finished(task, result, callback))
+        self.pool.start(task)
+        
+    def on_task_finished(self, task, result, callback):
+        self.pending.discard(task)
+        if callback:
+            callback(result)
+            
+    def shutdown(self, timeout=2000):
+        self.pool.clear()
+        self.pool.waitForDone(timeout)
+
+# 统一的定时调度线程：阻塞等待最近一个到期任务，没有任务时不唤醒，stop()立即唤醒。
+# 到期的任务通过信号交回GUI线程执行，网络请求再交给ApiExecutor，调度线程本身不做阻塞操作。
+class TaskScheduler(QThread):
+    job_due = Signal(object)
     
-    def send_heartbeat(self):
-        try:
-            response = requests.post(
-                f"{self.base_url}/api/whiteboard/heartbeat",
-                headers=self.headers,
-                timeout=10
-            )
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.condition = threading.Condition()
+        self.jobs = []
+        self.sequence = itertools.count()
+        self.running = False
+        self.wakeups = 0
+        self.started_at = time.monotonic()
+        self.job_due.connect(self.dispatch)
+        
+    def start(self):
+        self.running = True
+        self.started_at = time.monotonic()
+        super().start()
+        
+    def call_later(self, delay, callback):
+        with self.condition:
+            # [到期时间, 序号, 回调, 已取消]，序号保证堆比较不会比到回调
+            job = [time.monotonic() + max(delay, 0), next(self.sequence), callback, False]
+            heapq.heappush(self.jobs, job)
+            self.condition.notify()
+        return job
+        
+    def cancel(self, job):
+        if job:
+            job[3] = True
             
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {"success": False, "error": f"HTTP错误: {response.status_code}"}
+    def run(self):
+        while True:
+            with self.condition:
+                while self.running:
+                    while self.jobs and self.jobs[0][3]:
+                        heapq.heappop(self.jobs)
+                    now = time.monotonic()
+                    if self.jobs and self.jobs[0][0] <= now:
+                        break
+                    timeout = self.jobs[0][0] - now if self.jobs else None
+                    self.condition.wait(timeout)
+                    self.wakeups += 1
+                if not self.running:
+                    return
+                job = heapq.heappop(self.jobs)
+            self.job_due.emit(job)
+            
+    def dispatch(self, job):
+        if job[3]:
+            return
+        try:
+            job[2]()
         except Exception as e:
-            return {"success": False, "error": str(e)}
+            scheduler_log.exception("定时任务执行失败: %s", e)
+            
+    def wakeups_per_minute(self):
+        minutes = max(time.monotonic() - self.started_at, 1) / 60
+        return self.wakeups / minutes
+        
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.wait(2000)
+        scheduler_log.info("调度线程已停止，平均每分钟唤醒 %.1f 次", self.wakeups_per_minute())
 
-class DataFetchThread(QThread):
-    data_fetched = Signal(list)
+class DataFetcher(QObject):
+    data_fetched = Signal(list, object)  # 数据, board_version
+    data_partial = Signal(list)  # 大响应下载途中已解析出的条目
+    fetch_started = Signal()
     error_occurred = Signal(str)
     
-    def __init__(self, api_client):
+    def __init__(self, api_client, scheduler, executor):
         super().__init__()
         self.api_client = api_client
-        self.running = True
+        self.scheduler = scheduler
+        self.executor = executor
+        self.running = False
+        self.in_flight = False
+        self.job = None
         self.last_fetch_time = 0
+        self.next_fetch_time = 0
+        # Socket.IO断开时的轮询间隔
         self.fetch_interval = 30
+        # Socket.IO正常推送时只做低频兜底
+        self.push_interval = 300
+        # 连续失败时指数退避的上限
+        self.max_backoff = 600
+        self.push_healthy = False
+        self.failures = 0
+        
+    def start(self):
+        self.running = True
+        self.schedule(0)
         
-    def run(self):
-        while self.running:
-            current_time = time.time()
-            if (current_time - self.last_fetch_time) >= self.fetch_interval:
-                if self.api_client.board_id and self.api_client.secret_key:
-                    try:
-                        result = self.api_client.get_all_data()
-                        if result.get('success'):
-                            self.data_fetched.emit(result.get('data', []))
-                            self.last_fetch_time = current_time
-                            print(f"数据获取成功，共{len(result.get('data', []))}条数据")
-                        else:
-                            self.error_occurred.emit(f"数据获取失败: {result.get('error', '未知错误')}")
-                    except Exception as e:
-                        self.error_occurred.emit(f"网络错误: {str(e)}")
-            time.sleep(1)
+    def isRunning(self):
+        return self.running
+        
+    def schedule(self, delay):
+        self.scheduler.cancel(self.job)
+        self.next_fetch_time = time.time() + delay
+        self.job = self.scheduler.call_later(delay, self.fetch)
+        
+    def fetch(self):
+        if not self.running or self.in_flight:
+            return
+        if not (self.api_client.board_id and self.api_client.secret_key):
+            self.schedule(self.current_interval())
+            return
+            
+        self.in_flight = True
+        self.fetch_started.emit()
+        self.executor.submit(self.api_client.get_all_data, callback=self.on_fetch_result,
+                             progress=self.data_partial.emit)
+        
+    def on_fetch_result(self, result):
+        self.in_flight = False
+        if not self.running:
+            return
+            
+        success = False
+        if result.get('success'):
+            success = True
+            self.last_fetch_time = time.time()
+            if result.get('not_modified'):
+                fetch_log.debug("数据未变化")
+            else:
+                self.data_fetched.emit(result.get('data', []), result.get('board_version'))
+                fetch_log.debug("数据获取成功，共%d条数据", len(result.get('data', [])))
+        else:
+            self.error_occurred.emit(f"数据获取失败: {result.get('error', '未知错误')}")
+        self.schedule_next(success)
+            
+    def current_interval(self):
+        return self.push_interval if self.push_healthy else self.fetch_interval
+        
+    def schedule_next(self, success):
+        if success:
+            self.failures = 0
+            delay = self.current_interval()
+        else:
+            # 指数退避加随机抖动，避免大量白板在服务器恢复时同时重试
+            self.failures += 1
+            delay = min(self.max_backoff, self.fetch_interval * 2 ** (self.failures - 1))
+            delay = random.uniform(delay / 2, delay)
+        self.schedule(delay)
+        
+    def set_push_healthy(self, healthy):
+        self.push_healthy = healthy
+        if not healthy and not self.failures and self.running and not self.in_flight:
+            # 推送断开后恢复正常轮询频率
+            target = self.last_fetch_time + self.fetch_interval
+            if target < self.next_fetch_time:
+                self.schedule(max(target - time.time(), 0))
             
     def stop(self):
         self.running = False
+        self.scheduler.cancel(self.job)
+        self.job = None
 
-class HeartbeatThread(QThread):
+# 统一的在线状态上报：Socket.IO连接时走WebSocket心跳，断开时才退回HTTP心跳，
+# 最近已有成功的数据请求时跳过HTTP心跳
+class LivenessMonitor(QObject):
     heartbeat_sent = Signal(bool, str)
     
-    def __init__(self, api_client, parent=None):
+    def __init__(self, api_client, scheduler, executor, parent=None):
         super().__init__(parent)
         self.api_client = api_client
+        self.scheduler = scheduler
+        self.executor = executor
+        self.socketio_thread = None
+        self.running = False
+        self.job = None
+        self.socket_interval = 10
+        self.http_interval = 30
+        self.counts = {"socket": 0, "http": 0, "piggybacked": 0}
+        self.socket_state = False
+        
+    def set_socket(self, socketio_thread):
+        self.socketio_thread = socketio_thread
+        
+    def socket_connected(self):
+        return bool(self.socketio_thread and self.socketio_thread.is_connected(self.api_client.board_id))
+        
+    def start(self):
         self.running = True
-        self.interval = 30
+        self.beat()
         
-    def run(self):
-        while self.running:
-            if self.api_client.board_id and self.api_client.secret_key:
-                try:
-                    result = self.api_client.send_heartbeat()
-                    success = result.get('success', False)
-                    message = result.get('message', '未知状态')
-                    self.heartbeat_sent.emit(success, message)
-                    print(f"心跳发送: {success}, {message}")
-                except Exception as e:
-                    self.heartbeat_sent.emit(False, str(e))
-                    print(f"心跳发送失败: {str(e)}")
-            
-            for i in range(self.interval * 2):
-                if not self.running:
-                    return
-                time.sleep(0.5)
+    def isRunning(self):
+        return self.running
+        
+    def beat(self):
+        if not self.running:
+            return
+            
+        if self.socket_connected():
+            self.socketio_thread.send_heartbeat(self.api_client.board_id)
+            self.counts["socket"] += 1
+            interval = self.socket_interval
+        else:
+            interval = self.http_interval
+            if time.time() - self.api_client.heartbeat_ack_time < self.http_interval:
+                self.counts["piggybacked"] += 1
+                liveness_log.debug("服务器已确认最近的数据请求算作心跳，跳过HTTP心跳")
+            elif self.api_client.board_id and self.api_client.secret_key:
+                self.counts["http"] += 1
+                self.executor.submit(self.api_client.send_heartbeat, callback=self.on_result)
+                
+        self.scheduler.cancel(self.job)
+        self.job = self.scheduler.call_later(interval, self.beat)
+        
+    def on_socket_state_changed(self, connected):
+        # 通道切换后立即按新通道上报一次，并重新计时；重复的错误事件不重复上报
+        if connected == self.socket_state:
+            return
+        self.socket_state = connected
+        if self.running:
+            self.beat()
+        
+    def on_result(self, result):
+        success = result.get('success', False)
+        message = result.get('message', result.get('error', '未知状态'))
+        self.heartbeat_sent.emit(success, message)
+        liveness_log.debug("心跳发送: %s, %s", success, message)
     
     def stop(self):
         self.running = False
+        self.scheduler.cancel(self.job)
+        self.job = None
+
+# 合并突发的推送事件：安静窗口内没有新事件、或距第一个事件超过最大延迟时一次性交出
+class EventCoalescer(QObject):
+    batch_ready = Signal(list)
+    
+    def __init__(self, quiet_ms=150, max_delay_ms=1000, parent=None):
+        super().__init__(parent)
+        self.events = []
+        self.events_received = 0
+        self.batches = 0
+        self.last_batch_size = 0
+        
+        self.quiet_timer = QTimer(self)
+        self.quiet_timer.setSingleShot(True)
+        self.quiet_timer.timeout.connect(self.flush)
+        self.max_timer = QTimer(self)
+        self.max_timer.setSingleShot(True)
+        self.max_timer.timeout.connect(self.flush)
+        self.configure(quiet_ms, max_delay_ms)
+        
+    def configure(self, quiet_ms, max_delay_ms):
+        self.quiet_timer.setInterval(quiet_ms)
+        self.max_timer.setInterval(max_delay_ms)
+        
+    def add(self, event):
+        self.events.append(event)
+        self.events_received += 1
+        self.quiet_timer.start()
+        if not self.max_timer.isActive():
+            self.max_timer.start()
+            
+    def events_merged(self):
+        # 因合并而省下的界面刷新次数
+        return self.events_received - self.batches
+            
+    def flush(self):
+        self.quiet_timer.stop()
+        self.max_timer.stop()
+        if not self.events:
+            return
+            
+        events = self.events
+        self.events = []
+        self.batches += 1
+        self.last_batch_size = len(events)
+        # 合并省下的界面刷新次数，即 events_merged() 的累计值
+        METRICS.count("socket events merged", len(events) - 1)
+        if len(events) > 1:
+            data_log.debug("合并了%d个推送事件", len(events))
+        self.batch_ready.emit(events)
+        
+    def clear(self):
+        self.quiet_timer.stop()
+        self.max_timer.stop()
+        self.events = []
+
+# 任务确认/完成的发送队列：短时间内的操作合并成一批，服务器支持时用一次批量请求发出，
+# 否则在连接池上并行逐个发送，整批结束后只刷新一次。未确认的操作保存在设置里，重启或断网后继续重试
+class TaskActionQueue(QObject):
+    action_done = Signal(object, str)  # 任务id, 操作
+    action_failed = Signal(object, str, str)  # 任务id, 操作, 错误
+    batch_finished = Signal()
+    
+    ACTIONS = ('acknowledge', 'complete')
+    
+    def __init__(self, api_client, executor, scheduler, batch_delay=0.3, parent=None):
+        super().__init__(parent)
+        self.api_client = api_client
+        self.executor = executor
+        self.scheduler = scheduler
+        self.batch_delay = batch_delay
+        self.board_id = None
+        # 等待发送的操作和已发出、未得到结果的操作: [{'task_id', 'action'}]
+        self.actions = []
+        self.in_flight = []
+        # 服务器是否有批量接口，None 表示还不知道
+        self.bulk_supported = None
+        self.flush_job = None
+        self.failures = 0
+        self.base_delay = 5
+        self.max_delay = 300
+        
+    def settings_key(self):
+        return re.sub(r'[^\w-]', '_', str(self.board_id))
+        
+    def load(self, board_id):
+        # 切换到某个白板时载入它上次没发出去的操作，返回这些操作以便重新乐观更新
+        if board_id == self.board_id:
+            return []
+        self.scheduler.cancel(self.flush_job)
+        # 上一个白板已发出、还没结果的操作存回它自己的键下，切回来时重发；之后到达的结果按白板丢弃
+        if self.board_id is not None:
+            self.save()
+        self.board_id = board_id
+        self.in_flight = []
+        self.failures = 0
+        try:
+            saved = json.loads(QSettings("WhiteboardClient", "PendingActions").value(self.settings_key(), "") or "[]")
+        except (TypeError, ValueError):
+            saved = []
+        self.actions = [entry for entry in saved if isinstance(entry, dict)
+                        and entry.get('task_id') is not None and entry.get('action') in self.ACTIONS]
+        if self.actions:
+            data_log.info("恢复%d个未发送的任务操作", len(self.actions))
+            self.schedule_flush(0)
+        return list(self.actions)
+        
+    def save(self):
+        settings = QSettings("WhiteboardClient", "PendingActions")
+        pending = self.in_flight + self.actions
+        if pending:
+            settings.setValue(self.settings_key(), json.dumps(pending))
+        else:
+            settings.remove(self.settings_key())
+            
+    def add(self, task_id, action):
+        entry = {'task_id': task_id, 'action': action}
+        if entry in self.actions or entry in self.in_flight:
+            return
+        self.actions.append(entry)
+        self.save()
+        # 正在退避重试时随下一次重试一起发出
+        if not self.failures:
+            self.schedule_flush(self.batch_delay)
+            
+    def schedule_flush(self, delay):
+        self.scheduler.cancel(self.flush_job)
+        self.flush_job = self.scheduler.call_later(delay, self.flush)
+        
+    def flush(self):
+        self.scheduler.cancel(self.flush_job)
+        self.flush_job = None
+        if self.in_flight or not self.actions or not self.api_client.board_id:
+            return
+            
+        batch = self.actions
+        board_id = self.board_id
+        self.actions = []
+        self.in_flight = batch
+        METRICS.count("actions batches")
+        METRICS.count("actions sent", len(batch))
+        if len(batch) > 1 and self.bulk_supported is not False:
+            self.executor.submit(self.api_client.batch_task_actions, batch,
+                                 callback=lambda result: self.on_bulk_result(board_id, batch, result))
+        else:
+            self.send_each(board_id, batch)
+            
+    def is_current(self, board_id, batch):
+        # 切换白板后，上一个白板的批次结果到达时直接丢弃
+        return board_id == self.board_id and batch is self.in_flight
+        
+    def on_bulk_result(self, board_id, batch, result):
+        if not self.is_current(board_id, batch):
+            return
+        if result.get('status') in (404, 405, 501):
+            data_log.info("服务器不支持批量任务操作，改为逐个并行发送")
+            self.bulk_supported = False
+            self.send_each(board_id, batch)
+            return
+            
+        if not result.get('success'):
+            self.finish(board_id, batch, [(entry, result) for entry in batch])
+            return
+            
+        self.bulk_supported = True
+        # 服务器没有逐条返回结果时视为全部成功；逐条的失败是服务器明确拒绝，没有状态码时不再重试
+        results = {}
+        for item in result.get('results') or []:
+            if isinstance(item, dict):
+                results[(str(item.get('task_id')), item.get('action'))] = dict(item, rejected=True)
+        self.finish(board_id, batch,
+                    [(entry, results.get((str(entry['task_id']), entry['action']), {'success': True}))
+                     for entry in batch])
+        
+    def send_each(self, board_id, batch):
+        # 每个操作一个工作线程，共用同一个连接池并行发送
+        outcomes = []
+        
+        def on_result(entry, result):
+            outcomes.append((entry, result))
+            if len(outcomes) == len(batch):
+                self.finish(board_id, batch, outcomes)
+                
+        for entry in batch:
+            api_call = getattr(self.api_client, f"{entry['action']}_task")
+            self.executor.submit(api_call, entry['task_id'],
+                                 callback=lambda result, entry=entry: on_result(entry, result))
+            
+    @staticmethod
+    def is_retryable(result):
+        # 网络错误、服务器错误和限流稍后重试，其余（如任务不存在）直接算失败
+        status = result.get('status')
+        if status is None:
+            return not result.get('rejected')
+        return status >= 500 or status in (408, 429)
+        
+    def finish(self, board_id, batch, outcomes):
+        if not self.is_current(board_id, batch):
+            return
+        self.in_flight = []
+        retry = []
+        settled = False
+        for entry, result in outcomes:
+            if result.get('success'):
+                settled = True
+                self.action_done.emit(entry['task_id'], entry['action'])
+            elif self.is_retryable(result):
+                retry.append(entry)
+            else:
+                settled = True
+                self.action_failed.emit(entry['task_id'], entry['action'], result.get('error', '未知错误'))
+                
+        self.actions = retry + self.actions
+        self.save()
+        if settled:
+            self.batch_finished.emit()
+            
+        if retry:
+            self.failures += 1
+            delay = min(self.max_delay, self.base_delay * 2 ** (self.failures - 1))
+            data_log.warning("%d个任务操作发送失败，%d秒后重试", len(retry), delay)
+            self.schedule_flush(random.uniform(delay / 2, delay))
+        else:
+            self.failures = 0
+            if self.actions:
+                self.schedule_flush(self.batch_delay)
+                
+    def stop(self):
+        # 已发出但还没有结果的操作也保留，下次启动时重发（确认/完成重复执行没有副作用）
+        self.scheduler.cancel(self.flush_job)
+        self.flush_job = None
+        if self.board_id is not None:
+            self.save()
 
 class DataManager(QObject):
     data_updated = Signal(list)
+    partition_updated = Signal(str, list, list)  # 分区名, 分区内条目, 变化的条目id
     task_acknowledged = Signal(str)
     task_completed = Signal(str)
     error_occurred = Signal(str)
-    system_notification = Signal(str, str, int)  # 添加紧急级别参数
+    system_notification = Signal(str, str, int, str)  # 标题, 内容, 紧急级别, 去重键
     socketio_status = Signal(bool, str)
     
-    def __init__(self):
+    def __init__(self, board=None, hub=None):
         super().__init__()
-        self.api_client = WhiteboardClientAPI()
-        self.data_thread = None
-        self.heartbeat_thread = None
+        # board 为 None 时是主白板，认证信息随设置变化；否则是 {board_id, secret_key, name}
+        self.board = board
+        # 线程池、调度线程、连接池和Socket.IO连接由 BoardHub 在多个白板间共享
+        self.owns_hub = hub is None
+        self.hub = hub or BoardHub()
+        self.api_client = WhiteboardClientAPI(session_source=self.hub.http)
+        self.store = BoardStore()
+        self.index = BoardIndex()
+        self.expiry_job = None
+        # 大响应边下载边显示时已收到的条目
+        self.partial_items = []
+        # 到期后稍晚一点再重建索引，保证这时公告已经判为过期
+        self.expiry_margin = 0.05
+        self.executor = self.hub.executor
+        self.refresh_in_flight = False
+        self.refresh_pending = False
+        # 已乐观更新、尚未得到服务器确认的任务: task_id -> 字段补丁
+        self.pending_actions = {}
+        self.coalescer = EventCoalescer()
+        self.coalescer.batch_ready.connect(self.apply_event_batch)
+        self.snapshot_cache = SnapshotCache()
+        # 数据变化后延迟几秒再落盘，连续变化只写一次
+        self.snapshot_delay = 3
+        self.snapshot_job = None
+        self.data_updated.connect(self.schedule_snapshot_save)
+        self.scheduler = self.hub.scheduler
+        self.task_actions = TaskActionQueue(self.api_client, self.executor, self.scheduler)
+        self.task_actions.action_done.connect(self.on_task_action_done)
+        self.task_actions.action_failed.connect(self.on_task_action_failed)
+        self.task_actions.batch_finished.connect(self.manual_refresh)
+        # 乐观更新前的条目，操作失败时用来回滚: (task_id, 操作) -> 条目
+        self.action_rollback = {}
+        self.data_fetcher = None
+        self.liveness = None
         self.socketio_thread = None
-        self.heartbeat_timer = QTimer()
-        self.heartbeat_timer.timeout.connect(self.send_socketio_heartbeat)
+        self.hub.register(self)
+        
+    def board_credentials(self):
+        if self.board:
+            return self.board.get('board_id', ''), self.board.get('secret_key', '')
+        settings = QSettings("WhiteboardClient", "Config")
+        return settings.value("board_id", ""), settings.value("secret_key", "")
         
     def setup(self, server, board_id, secret_key):
+        previous = self.api_client.board_id
+        if previous and board_id != previous:
+            self.switch_board(previous)
         self.api_client.setup(server, board_id, secret_key)
-        
-    def start_data_fetching(self):
-        if self.data_thread and self.data_thread.isRunning():
-            self.data_thread.stop()
+        # 上次退出或断网时没发出去的操作：重新乐观更新并排队重发
+        for entry in self.task_actions.load(board_id):
+            self.apply_task_patch(entry['task_id'], entry['action'])
+        
+    def switch_board(self, previous):
+        # 设置里换了白板：还没落盘的数据按旧白板保存，再清空旧白板的数据和乐观更新，
+        # 之后由 load_snapshot() 换上新白板的缓存
+        if self.snapshot_job is not None:
+            self.save_snapshot()
+        data_log.info("白板从%s切换到其他白板，清空本地数据", previous)
+        self.coalescer.clear()
+        self.store = BoardStore()
+        self.partial_items = []
+        self.pending_actions = {}
+        self.action_rollback = {}
+        self.update_index([])
+        
+    def load_snapshot(self):
+        # 只在还没有任何数据时用缓存垫底，之后由实时数据覆盖
+        if self.store.items or not self.api_client.board_id:
+            return False
+            
+        snapshot = self.snapshot_cache.load(self.api_client.board_id)
+        if not snapshot:
+            return False
             
-        self.data_thread = DataFetchThread(self.api_client)
-        self.data_thread.data_fetched.connect(self.data_updated)
-        self.data_thread.error_occurred.connect(self.error_occurred)
-        self.data_thread.start()
-        print("数据获取线程已启动")
+        self.store.replace_all(snapshot['items'], snapshot.get('version'))
+        self.apply_pending_actions()
+        STARTUP.mark("cached_data")
+        data_log.info("已载入本地缓存，共%d条数据", len(snapshot['items']))
+        self.publish()
+        return True
         
-    def start_heartbeat(self):
-        if self.heartbeat_thread and self.heartbeat_thread.isRunning():
-            self.heartbeat_thread.stop()
+    def publish(self):
+        data = self.store.snapshot()
+        self.data_updated.emit(data)
+        self.update_index(data)
+        
+    def update_index(self, data):
+        now = time.time()
+        for name, changed in self.index.update(data, now).items():
+            self.partition_updated.emit(name, self.index.items(name), sorted(changed))
             
-        self.heartbeat_thread = HeartbeatThread(self.api_client)
-        self.heartbeat_thread.heartbeat_sent.connect(self.on_heartbeat_result)
-        self.heartbeat_thread.start()
-        print("心跳线程已启动")
+        # 公告到期时从索引里移除，不需要向服务器重新拉取
+        self.scheduler.cancel(self.expiry_job)
+        self.expiry_job = None
+        if self.index.expires_at is not None:
+            self.expiry_job = self.scheduler.call_later(
+                self.index.expires_at - now + self.expiry_margin, self.on_expiry_due)
+            
+    def on_expiry_due(self):
+        self.expiry_job = None
+        self.update_index(self.store.snapshot())
         
-    def start_socketio(self):
-        if not SOCKETIO_AVAILABLE:
-            error_msg = "python-socketio不可用"
-            print(error_msg)
-            self.socketio_status.emit(False, error_msg)
+    def schedule_snapshot_save(self, _data=None):
+        if self.snapshot_job is None:
+            self.snapshot_job = self.scheduler.call_later(self.snapshot_delay, self.save_snapshot)
+            
+    def save_snapshot(self, blocking=False):
+        self.scheduler.cancel(self.snapshot_job)
+        self.snapshot_job = None
+        if not self.api_client.board_id:
             return
             
-        if self.socketio_thread and self.socketio_thread.isRunning():
-            print("停止现有的Socket.IO客户端")
-            self.socketio_thread.stop()
-            self.socketio_thread.wait(2000)
+        # 条目字典只会被整体替换不会原地修改，快照列表可以直接交给后台线程序列化
+        args = (self.api_client.board_id, self.store.snapshot(), self.store.version)
+        if blocking:
+            self.write_snapshot(*args)
+        else:
+            self.executor.submit(self.write_snapshot, *args)
             
-        self.socketio_thread = SocketIOClientThread()
+    def write_snapshot(self, board_id, items, version):
+        try:
+            self.snapshot_cache.save(board_id, [item.to_dict() for item in items], version)
+        except OSError as e:
+            data_log.warning("保存本地缓存失败: %s", e)
+        return {"success": True}
         
-        self.socketio_thread.message_received.connect(self.on_socketio_message)
-        self.socketio_thread.connected.connect(self.on_socketio_connected)
-        self.socketio_thread.disconnected.connect(self.on_socketio_disconnected)
-        self.socketio_thread.error_occurred.connect(self.on_socketio_error)
-        self.socketio_thread.refresh_requested.connect(self.on_refresh_requested)
-        self.socketio_thread.system_notification.connect(self.on_system_notification)
+    def start_data_fetching(self):
+        if self.data_fetcher and self.data_fetcher.isRunning():
+            self.data_fetcher.stop()
+            
+        self.data_fetcher = DataFetcher(self.api_client, self.scheduler, self.executor)
+        self.data_fetcher.data_fetched.connect(self.on_data_fetched)
+        self.data_fetcher.data_partial.connect(self.on_data_partial)
+        self.data_fetcher.fetch_started.connect(self.reset_partial_items)
+        self.data_fetcher.error_occurred.connect(self.on_fetch_failed)
+        self.data_fetcher.error_occurred.connect(self.error_occurred)
+        self.data_fetcher.set_push_healthy(
+            bool(self.socketio_thread and self.socketio_thread.is_connected(self.api_client.board_id)))
+        self.data_fetcher.start()
+        data_log.info("数据定时获取已启动")
         
-        settings = QSettings("WhiteboardClient", "Config")
-        board_id = settings.value("board_id", "")
-        secret_key = settings.value("secret_key", "")
+    def start_heartbeat(self):
+        if self.liveness and self.liveness.isRunning():
+            self.liveness.stop()
+            
+        self.liveness = LivenessMonitor(self.api_client, self.scheduler, self.executor)
+        self.liveness.set_socket(self.socketio_thread)
+        self.liveness.heartbeat_sent.connect(self.on_heartbeat_result)
+        self.liveness.start()
+        data_log.info("在线状态上报已启动")
         
-        if board_id and secret_key:
-            self.socketio_thread.setup(SERVER, board_id, secret_key)
-            self.socketio_thread.start()
-            print("Socket.IO客户端启动命令已发送")
-        else:
-            error_msg = "缺少配置，无法启动Socket.IO"
-            print(error_msg)
-            self.socketio_status.emit(False, error_msg)
+    def start_socketio(self):
+        # 所有白板共用一个连接，由 BoardHub 统一启动
+        self.hub.start_socketio()
+        
+    def set_socket(self, socketio_thread):
+        self.socketio_thread = socketio_thread
+        if self.liveness:
+            self.liveness.set_socket(socketio_thread)
             
     def on_refresh_requested(self):
-        print("Socket.IO触发数据刷新")
-        self.manual_refresh()
+        self.coalescer.add(('refresh',))
+        
+    def reset_partial_items(self):
+        # 每次拉取开始时清空，上一次流留下的条目不会混进这一次的部分结果
+        self.partial_items = []
+        
+    def on_fetch_failed(self, error):
+        # 流中途失败时撤掉只显示了一半的条目，恢复本地存储里原有的数据
+        if self.partial_items:
+            self.partial_items = []
+            self.update_index(self.store.snapshot())
+        
+    def on_data_partial(self, items):
+        # 只在还没有任何数据时先显示已到达的部分，已有数据（缓存或上次同步）时等完整结果。
+        # 部分条目不写入本地存储，只交给窗口分区显示，所以不会被当成整个白板保存到本地缓存
+        if self.store.items:
+            return
+        STARTUP.mark("first_items")
+        self.partial_items.extend(items)
+        self.update_index(self.partial_items)
+        
+    def on_data_fetched(self, data, version):
+        STARTUP.mark("first_data")
+        self.partial_items = []
+        self.store.replace_all(data, version)
+        self.apply_pending_actions()
+        self.publish()
+        
+    def apply_pending_actions(self):
+        # 缓存或请求途中拉到的旧数据不能覆盖还未确认的乐观更新
+        for task_id, patch in self.pending_actions.items():
+            if self.store.get('task', task_id):
+                self.store.upsert('task', dict(patch, id=task_id))
+        
+    def on_item_upserted(self, item_type, item):
+        self.coalescer.add(('upsert', item_type, item))
+        
+    def on_item_deleted(self, item_type, item_id, version=None):
+        self.coalescer.add(('delete', item_type, item_id, version))
+        
+    def apply_event_batch(self, events):
+        # 按到达顺序逐条写入本地存储（保证版本检查准确），界面只刷新一次，全量同步也最多一次
+        needs_refresh = False
+        changed = False
+        for event in events:
+            kind = event[0]
+            if kind == 'refresh':
+                needs_refresh = True
+            elif kind == 'upsert':
+                item_type, item = event[1], event[2]
+                if item.get('id') is None or not self.store.check_version(item.get('board_version')):
+                    needs_refresh = True
+                    continue
+                self.store.upsert(item_type, item)
+                changed = True
+            elif kind == 'delete':
+                # 删除同样推进版本号，否则下一条更新会被误判为漏了事件
+                if not self.store.check_version(event[3]):
+                    needs_refresh = True
+                    continue
+                if self.store.remove(event[1], event[2]):
+                    changed = True
+                    
+        if changed:
+            self.publish()
+        if needs_refresh:
+            data_log.debug("Socket.IO触发数据刷新")
+            self.manual_refresh()
         
-    def on_system_notification(self, title, content, level):
-        print(f"显示系统通知: {title}, 级别: {level}")
-        self.system_notification.emit(title, content, level)
+    def on_system_notification(self, title, content, level, key=""):
+        data_log.debug("显示系统通知: %s, 级别: %s", title, level)
+        self.system_notification.emit(title, content, level, key)
         
     def on_socketio_connected(self):
-        print("Socket.IO连接成功")
+        data_log.debug("Socket.IO连接成功")
         self.socketio_status.emit(True, "连接成功")
-        self.heartbeat_timer.start(10000)
+        self.set_push_healthy(True)
         
     def on_socketio_disconnected(self):
-        print("Socket.IO连接断开")
+        data_log.debug("Socket.IO连接断开")
         self.socketio_status.emit(False, "连接断开")
-        self.heartbeat_timer.stop()
+        self.set_push_healthy(False)
+        
+    def set_push_healthy(self, healthy):
+        # 推送通道正常时轮询降到兜底频率、心跳改走WebSocket，断开时恢复
+        if self.data_fetcher:
+            self.data_fetcher.set_push_healthy(healthy)
+        if self.liveness:
+            self.liveness.on_socket_state_changed(healthy)
         
     def on_socketio_error(self, error_msg):
-        print(f"Socket.IO错误: {error_msg}")
+        self.set_push_healthy(False)
+        data_log.warning("Socket.IO错误: %s", error_msg)
         self.socketio_status.emit(False, f"错误: {error_msg}")
         self.error_occurred.emit(f"Socket.IO错误: {error_msg}")
         
     def on_socketio_message(self, message):
-        print(f"收到Socket.IO消息: {message.get('type')}")
-        
-    def send_socketio_heartbeat(self):
-        if self.socketio_thread:
-            self.socketio_thread.send_heartbeat()
+        data_log.debug("收到Socket.IO消息: %s", message.get('type'))
         
+    # 操作 -> (乐观更新的字段, 完成提示, 失败提示)
+    TASK_ACTIONS = {
+        'acknowledge': ({'is_acknowledged': True}, "已确认", "确认任务失败"),
+        'complete': ({'is_completed': True}, "已完成", "完成任务失败")
+    }
+    
     def acknowledge_task(self, task_id):
-        result = self.api_client.acknowledge_task(task_id)
-        if result.get('success'):
-            self.task_acknowledged.emit(task_id)
-            title = task_id
-            content = "已确认" 
-            self.system_notification.emit(title, content, 1)
-            self.manual_refresh()
-        else:
-            self.error_occurred.emit(f"确认任务失败: {result.get('error', '未知错误')}")
+        self.queue_task_action(task_id, 'acknowledge')
             
     def complete_task(self, task_id):
-        result = self.api_client.complete_task(task_id)
+        self.queue_task_action(task_id, 'complete')
+        
+    def queue_task_action(self, task_id, action):
+        # 先乐观更新界面，由操作队列合并发送，失败再回滚
+        previous = self.store.get('task', task_id)
+        if previous:
+            self.action_rollback.setdefault((task_id, action), previous)
+        self.apply_task_patch(task_id, action)
+        self.task_actions.add(task_id, action)
+        
+    def apply_task_patch(self, task_id, action):
+        patch = self.TASK_ACTIONS[action][0]
+        self.pending_actions[task_id] = dict(self.pending_actions.get(task_id, {}), **patch)
+        if self.store.get('task', task_id):
+            self.store.upsert('task', dict(patch, id=task_id))
+            self.publish()
+            
+    def clear_task_patch(self, task_id, action):
+        patch = self.pending_actions.get(task_id, {})
+        for field in self.TASK_ACTIONS[action][0]:
+            patch.pop(field, None)
+        if not patch:
+            self.pending_actions.pop(task_id, None)
+            
+    def on_task_action_done(self, task_id, action):
+        self.clear_task_patch(task_id, action)
+        self.action_rollback.pop((task_id, action), None)
+        done_text = self.TASK_ACTIONS[action][1]
+        (self.task_acknowledged if action == 'acknowledge' else self.task_completed).emit(str(task_id))
+        self.system_notification.emit(str(task_id), done_text, 1, f"task:{task_id}:{done_text}")
+        
+    def on_task_action_failed(self, task_id, action, error):
+        self.clear_task_patch(task_id, action)
+        previous = self.action_rollback.pop((task_id, action), None)
+        if previous:
+            self.store.restore('task', task_id, previous)
+            self.publish()
+        self.error_occurred.emit(f"{self.TASK_ACTIONS[action][2]}: {error}")
+            
+    def manual_refresh(self):
+        if not (self.api_client.board_id and self.api_client.secret_key):
+            return
+            
+        # 已有刷新在进行时只记一次，等它结束后再补一次
+        if self.refresh_in_flight:
+            self.refresh_pending = True
+            return
+            
+        self.refresh_in_flight = True
+        self.executor.submit(self.api_client.get_all_data, callback=self.on_refresh_result)
+        
+    def on_refresh_result(self, result):
+        self.refresh_in_flight = False
         if result.get('success'):
-            self.task_completed.emit(task_id)
-            title = task_id
-            content = "已完成" 
-            self.system_notification.emit(title, content, 1)
-            self.manual_refresh()
+            # 服务器数据未变且本地也没改过，就不必重建界面
+            if not (result.get('not_modified') and not self.store.dirty):
+                self.on_data_fetched(result.get('data', []), result.get('board_version'))
+            data_log.debug("手动刷新数据成功")
         else:
-            self.error_occurred.emit(f"完成任务失败: {result.get('error', '未知错误')}")
+            self.error_occurred.emit(f"刷新数据失败: {result.get('error', '未知错误')}")
             
-    def manual_refresh(self):
-        if self.api_client.board_id and self.api_client.secret_key:
-            try:
-                result = self.api_client.get_all_data()
-                if result.get('success'):
-                    self.data_updated.emit(result.get('data', []))
-                    print("手动刷新数据成功")
-                else:
-                    self.error_occurred.emit(f"刷新数据失败: {result.get('error', '未知错误')}")
-            except Exception as e:
-                self.error_occurred.emit(f"刷新数据失败: {str(e)}")
+        if self.refresh_pending:
+            self.refresh_pending = False
+            self.manual_refresh()
                 
     def on_heartbeat_result(self, success, message):
         if not success:
-            print(f"心跳发送失败: {message}")
+            data_log.warning("心跳发送失败: %s", message)
+            
+    def stop(self):
+        self.coalescer.clear()
+        self.task_actions.stop()
+        self.scheduler.cancel(self.expiry_job)
+        if self.snapshot_job is not None:
+            self.save_snapshot(blocking=True)
+        if self.data_fetcher:
+            self.data_fetcher.stop()
+        if self.liveness:
+            self.liveness.stop()
+        self.hub.unregister(self)
+        if self.owns_hub:
+            self.hub.stop()
+
+# 单进程多白板：所有白板共用一个线程池、一个调度线程、一个HTTP连接池和一条Socket.IO连接，
+# 推送事件按数据里的 board_id 分发给对应白板的 DataManager
+class BoardHub(QObject):
+    def __init__(self, parent=None):
+        # 是QObject，连接线程发出的信号才会排队回到GUI线程执行
+        super().__init__(parent)
+        self.executor = ApiExecutor()
+        self.scheduler = TaskScheduler()
+        self.scheduler.start()
+        # 只用来持有共享的连接池
+        self.http = WhiteboardClientAPI()
+        self.managers = []
+        self.socketio_thread = None
+        self.socket_start_pending = False
+        self.stopped = False
+        # 所有白板共用的托盘，由第一个 WindowManager 创建
+        self.tray = None
+        
+    def register(self, data_manager):
+        self.managers.append(data_manager)
+        if self.socketio_thread:
+            data_manager.set_socket(self.socketio_thread)
+        
+    def unregister(self, data_manager):
+        if data_manager in self.managers:
+            self.managers.remove(data_manager)
+            
+    def manager_for(self, board_id):
+        # 未指明白板的事件属于主白板（连接参数里的那个）
+        for data_manager in self.managers:
+            if data_manager.api_client.board_id == board_id:
+                return data_manager
+        return self.managers[0] if self.managers and not board_id else None
+        
+    def start_socketio(self):
+        # 多个白板在同一轮事件里相继启动，合并成一次连接配置
+        if not self.socket_start_pending:
+            self.socket_start_pending = True
+            QTimer.singleShot(0, self.apply_socketio)
+            
+    def apply_socketio(self):
+        self.socket_start_pending = False
+        if self.stopped:
+            return
+        if not socketio_available():
+            self.broadcast_status("python-socketio不可用")
+            return
+            
+        boards = []
+        for data_manager in self.managers:
+            board_id, secret_key = data_manager.board_credentials()
+            if board_id and secret_key:
+                boards.append((board_id, secret_key))
+            else:
+                data_manager.socketio_status.emit(False, "缺少配置，无法启动Socket.IO")
+        if not boards:
+            data_log.warning("缺少配置，无法启动Socket.IO")
+            if self.socketio_thread and self.socketio_thread.isRunning():
+                data_log.info("停止现有的Socket.IO客户端")
+                self.socketio_thread.stop()
+            return
+            
+        (board_id, secret_key), extra_boards = boards[0], boards[1:]
+        if self.socketio_thread and self.socketio_thread.isRunning():
+            # 线程自己负责重连，配置变化时只需让它换配置
+            self.socketio_thread.reconfigure(SERVER, board_id, secret_key, extra_boards)
+            return
+            
+        thread = SocketIOClientThread()
+        thread.message_received.connect(self.on_message)
+        thread.boards_joined.connect(self.on_boards_joined)
+        thread.disconnected.connect(self.on_disconnected)
+        thread.error_occurred.connect(self.on_error)
+        thread.refresh_requested.connect(self.on_refresh_requested)
+        thread.item_upserted.connect(self.on_item_upserted)
+        thread.item_deleted.connect(self.on_item_deleted)
+        thread.system_notification.connect(self.on_system_notification)
+        self.socketio_thread = thread
+        for data_manager in self.managers:
+            data_manager.set_socket(thread)
             
+        thread.extra_boards = extra_boards
+        thread.setup(SERVER, board_id, secret_key)
+        thread.start()
+        data_log.info("Socket.IO客户端启动命令已发送，共%d个白板", len(boards))
+        
+    def broadcast_status(self, error_msg):
+        data_log.error(error_msg)
+        for data_manager in self.managers:
+            data_manager.socketio_status.emit(False, error_msg)
+            
+    def on_boards_joined(self, board_ids):
+        for data_manager in self.managers:
+            if data_manager.api_client.board_id in board_ids:
+                data_manager.on_socketio_connected()
+            else:
+                data_manager.on_socketio_disconnected()
+                
+    def on_disconnected(self):
+        for data_manager in self.managers:
+            data_manager.on_socketio_disconnected()
+            
+    def on_error(self, error_msg):
+        for data_manager in self.managers:
+            data_manager.on_socketio_error(error_msg)
+            
+    def on_refresh_requested(self, board_id):
+        data_manager = self.manager_for(board_id)
+        if data_manager:
+            data_manager.on_refresh_requested()
+            
+    def on_message(self, message):
+        data = message.get('data') or {}
+        data_manager = self.manager_for(str(data.get('board_id') or ''))
+        if data_manager:
+            data_manager.on_socketio_message(message)
+            
+    def on_item_upserted(self, item_type, item):
+        data_manager = self.manager_for(str(item.get('board_id') or ''))
+        if data_manager:
+            data_manager.on_item_upserted(item_type, item)
+            
+    def on_item_deleted(self, item_type, item_id, board_id, version):
+        data_manager = self.manager_for(board_id)
+        if data_manager:
+            data_manager.on_item_deleted(item_type, item_id, version)
+            
+    def on_system_notification(self, title, content, level, key, board_id):
+        data_manager = self.manager_for(board_id)
+        if data_manager:
+            data_manager.on_system_notification(title, content, level, key)
+            
+    def shutdown(self):
+        for data_manager in list(self.managers):
+            data_manager.stop()
+        self.stop()
+        
     def stop(self):
-        self.heartbeat_timer.stop()
-        
-        if self.data_thread:
-            self.data_thread.stop()
-            self.data_thread.wait(2000)
-        if self.heartbeat_thread:
-            self.heartbeat_thread.stop()
-            self.heartbeat_thread.wait(2000)
+        if self.stopped:
+            return
+        self.stopped = True
         if self.socketio_thread:
             self.socketio_thread.stop()
+        self.scheduler.stop()
+        self.executor.shutdown()
 
 class AnimatedButton(QPushButton):
     def __init__(self, text="", parent=None):
@@ -853,52 +2379,152 @@ class AnimatedButton(QPushButton):
 
 # 样式配置类
 class StyleConfig:
+    # 进程内缓存，只在设置保存时失效，渲染时不再逐条读取QSettings
+    _cache = {}
+    
+    DEFAULTS = {
+        "title_font_size": 10,
+        "title_color": "#2c3e50",
+        "title_bold": True,
+        "subject_font_size": 8,
+        "subject_color": "#7f8c8d",
+        "content_font_size": 8,
+        "content_color": "#7f8c8d",
+        "time_font_size": 7,
+        "time_color": "#95a5a6"
+    }
+    
     @staticmethod
     def get_task_style():
-        settings = QSettings("WhiteboardClient", "Styles")
-        return {
-            "title_font_size": settings.value("task_title_font_size", 10, type=int),
-            "title_color": settings.value("task_title_color", "#2c3e50"),
-            "title_bold": settings.value("task_title_bold", True, type=bool),
-            "subject_font_size": settings.value("task_subject_font_size", 8, type=int),
-            "subject_color": settings.value("task_subject_color", "#7f8c8d"),
-            "content_font_size": settings.value("task_content_font_size", 8, type=int),
-            "content_color": settings.value("task_content_color", "#7f8c8d"),
-            "time_font_size": settings.value("task_time_font_size", 7, type=int),
-            "time_color": settings.value("task_time_color", "#95a5a6")
-        }
+        return StyleConfig.get_style("task")
     
     @staticmethod
     def get_assignment_style():
-        settings = QSettings("WhiteboardClient", "Styles")
-        return {
-            "title_font_size": settings.value("assignment_title_font_size", 10, type=int),
-            "title_color": settings.value("assignment_title_color", "#2c3e50"),
-            "title_bold": settings.value("assignment_title_bold", True, type=bool),
-            "subject_font_size": settings.value("assignment_subject_font_size", 8, type=int),
-            "subject_color": settings.value("assignment_subject_color", "#7f8c8d"),
-            "content_font_size": settings.value("assignment_content_font_size", 8, type=int),
-            "content_color": settings.value("assignment_content_color", "#7f8c8d"),
-            "time_font_size": settings.value("assignment_time_font_size", 7, type=int),
-            "time_color": settings.value("assignment_time_color", "#95a5a6")
-        }
+        return StyleConfig.get_style("assignment")
     
     @staticmethod
     def get_announcement_style():
-        settings = QSettings("WhiteboardClient", "Styles")
-        return {
-            "title_font_size": settings.value("announcement_title_font_size", 10, type=int),
-            "title_color": settings.value("announcement_title_color", "#2c3e50"),
-            "title_bold": settings.value("announcement_title_bold", True, type=bool),
-            "subject_font_size": settings.value("announcement_subject_font_size", 8, type=int),
-            "subject_color": settings.value("announcement_subject_color", "#7f8c8d"),
-            "content_font_size": settings.value("announcement_content_font_size", 8, type=int),
-            "content_color": settings.value("announcement_content_color", "#7f8c8d"),
-            "time_font_size": settings.value("announcement_time_font_size", 7, type=int),
-            "time_color": settings.value("announcement_time_color", "#95a5a6")
-        }
+        return StyleConfig.get_style("announcement")
+        
+    @staticmethod
+    def get_default_style():
+        style = StyleConfig._cache.get(None)
+        if style is None:
+            style = StyleConfig.prepare(dict(StyleConfig.DEFAULTS))
+            StyleConfig._cache[None] = style
+        return style
+        
+    @staticmethod
+    def get_style(kind):
+        style = StyleConfig._cache.get(kind)
+        if style is None:
+            settings = QSettings("WhiteboardClient", "Styles")
+            values = {}
+            for name, default in StyleConfig.DEFAULTS.items():
+                values[name] = settings.value(f"{kind}_{name}", default, type=type(default))
+            style = StyleConfig.prepare(values)
+            StyleConfig._cache[kind] = style
+        return style
+        
+    @staticmethod
+    def prepare(style):
+        # 预先构建字体和样式表，所有条目共用同一份
+        title_font = QFont()
+        title_font.setPointSize(style["title_font_size"])
+        title_font.setBold(style["title_bold"])
+        content_font = QFont()
+        content_font.setPointSize(style["content_font_size"])
+        time_font = QFont()
+        time_font.setPointSize(style["time_font_size"])
+        
+        style["title_font"] = title_font
+        style["content_font"] = content_font
+        style["time_font"] = time_font
+        style["item_qss"] = f"""
+            QLabel#itemTitle {{
+                color: {style['title_color']};
+            }}
+            QLabel#itemDetails {{
+                color: {style['content_color']};
+                margin-top: 3px;
+            }}
+            QLabel#itemTime {{
+                color: {style['time_color']};
+                margin-top: 6px;
+            }}
+        """
+        return style
+        
+    @staticmethod
+    def invalidate():
+        StyleConfig._cache.clear()
+
+# 条目、按钮和滚动条共用的样式表，每个窗口只设置一次，
+# 条目控件通过objectName选择变体，不再逐个setStyleSheet
+ITEM_STYLESHEET = """
+    DataItemWidget {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 rgba(255,255,255,0.9),
+            stop:1 rgba(250,250,250,0.9));
+        border-radius: 6px;
+        border: 1px solid #e0e0e0;
+        padding: 10px;
+    }
+    DataItemWidget:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 rgba(255,255,255,1),
+            stop:1 rgba(245,245,245,1));
+        border: 1px solid #d0d0d0;
+    }
+    QPushButton#ackButton, QPushButton#completeButton {
+        color: white;
+        border: none;
+        border-radius: 4px;
+        font-weight: bold;
+        padding: 4px 8px;
+        font-size: 9px;
+    }
+    QPushButton#ackButton {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #3498db, stop:1 #2980b9);
+    }
+    QPushButton#ackButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #3cb0fd, stop:1 #3498db);
+    }
+    QPushButton#completeButton {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #2ecc71, stop:1 #27ae60);
+    }
+    QPushButton#completeButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #58d68d, stop:1 #2ecc71);
+    }
+    QScrollArea, QListView {
+        border: none;
+        background: transparent;
+    }
+    QScrollBar:vertical {
+        background: rgba(255,255,255,0.3);
+        width: 6px;
+        border-radius: 3px;
+    }
+    QScrollBar::handle:vertical {
+        background: rgba(255,255,255,0.6);
+        border-radius: 3px;
+        min-height: 20px;
+    }
+    QScrollBar::handle:vertical:hover {
+        background: rgba(255,255,255,0.8);
+    }
+"""
 
 class BaseFloatingWindow(QMainWindow):
+    # 显示 BoardIndex 的哪个分区，由子类指定
+    partition = None
+    # 到达时间分界后稍晚一点再刷新，保证刷新时文字已经变了
+    TIME_TICK_MARGIN = 0.05
+    
     def __init__(self, title, color, parent=None):
         super().__init__(parent, Qt.FramelessWindowHint | Qt.Tool)
         self.title = title
@@ -907,6 +2533,14 @@ class BaseFloatingWindow(QMainWindow):
         self.is_collapsed = False
         self.normal_height = 400
         self.collapsed_height = 30
+        # 按条目id保存已有控件，刷新时只增删改有变化的行
+        self.item_widgets = {}
+        self.reconcile_stats = {"created": 0, "updated": 0, "destroyed": 0}
+        self.last_data = []
+        self.render_mode = QSettings("WhiteboardClient", "Config").value("render_mode", "widgets")
+        self.applied_style = None
+        # 剩余时间文字只靠一个定时任务推进，不用整表重建
+        self.time_job = None
         
         self.setup_ui()
         self.setup_dragging()
@@ -969,46 +2603,11 @@ class BaseFloatingWindow(QMainWindow):
         title_layout.addWidget(self.count_label)
         title_layout.addWidget(self.collapse_btn)
         
-        self.content_widget = QWidget()
-        self.content_layout = QVBoxLayout(self.content_widget)
-        self.content_layout.setSpacing(8)
-        self.content_layout.setContentsMargins(12, 8, 12, 8)
-        
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background: transparent;
-            }
-            QScrollBar:vertical {
-                background: rgba(255,255,255,0.3);
-                width: 6px;
-                border-radius: 3px;
-            }
-            QScrollBar::handle:vertical {
-                background: rgba(255,255,255,0.6);
-                border-radius: 3px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: rgba(255,255,255,0.8);
-            }
-        """)
-        self.scroll_area.setWidget(self.content_widget)
-        
         layout.addWidget(self.title_bar)
-        layout.addWidget(self.scroll_area)
+        self.main_layout = layout
+        self.build_body()
         
-        self.setStyleSheet(f"""
-            BaseFloatingWindow {{
-                background-color: rgba(255, 255, 255, 0.95);
-                border-radius: 8px;
-                border: 2px solid {self.color};
-            }}
-        """)
+        self.apply_window_style(self.get_style_config())
         
         shadow = QGraphicsDropShadowEffect()
         shadow.setBlurRadius(15)
@@ -1018,6 +2617,73 @@ class BaseFloatingWindow(QMainWindow):
         
         self.setFixedSize(300, self.normal_height)
         
+    def build_body(self):
+        # widgets: 每条数据一个控件；virtual: 列表模型+委托，只绘制可见行
+        if self.render_mode == "virtual":
+            self.item_model = BoardItemModel(self)
+            self.item_delegate = BoardItemDelegate(self)
+            
+            # 列表视图本身也是滚动区域，收起/展开动画同样作用于它
+            self.scroll_area = BoardListView()
+            self.scroll_area.setModel(self.item_model)
+            self.scroll_area.setItemDelegate(self.item_delegate)
+            self.scroll_area.setMouseTracking(True)
+            self.scroll_area.setSelectionMode(QListView.NoSelection)
+            self.scroll_area.setVerticalScrollMode(QListView.ScrollPerPixel)
+            self.scroll_area.setLayoutMode(QListView.Batched)
+            self.scroll_area.setBatchSize(100)
+            self.scroll_area.setSpacing(4)
+            self.scroll_area.setFocusPolicy(Qt.NoFocus)
+            self.content_widget = None
+            self.content_layout = None
+        else:
+            self.item_model = None
+            self.item_delegate = None
+            
+            self.content_widget = QWidget()
+            self.content_layout = QVBoxLayout(self.content_widget)
+            self.content_layout.setSpacing(8)
+            self.content_layout.setContentsMargins(12, 8, 12, 8)
+            
+            self.scroll_area = QScrollArea()
+            self.scroll_area.setWidgetResizable(True)
+            self.scroll_area.setWidget(self.content_widget)
+            
+        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.main_layout.addWidget(self.scroll_area)
+        if self.is_collapsed:
+            self.scroll_area.hide()
+            
+    def apply_window_style(self, style_config):
+        # 样式配置来自缓存，只有设置保存后才会换成新对象，才需要重新解析样式表
+        if style_config is self.applied_style:
+            return
+            
+        self.applied_style = style_config
+        self.setStyleSheet(f"""
+            BaseFloatingWindow {{
+                background-color: rgba(255, 255, 255, 0.95);
+                border-radius: 8px;
+                border: 2px solid {self.color};
+            }}
+        """ + ITEM_STYLESHEET + style_config['item_qss'])
+        
+    def set_render_mode(self, render_mode):
+        if render_mode == self.render_mode:
+            return
+            
+        self.render_mode = render_mode
+        self.main_layout.removeWidget(self.scroll_area)
+        self.scroll_area.deleteLater()
+        # 模型和委托挂在窗口上，不会随列表视图一起释放
+        if self.item_model is not None:
+            self.item_model.deleteLater()
+            self.item_delegate.deleteLater()
+        self.item_widgets = {}
+        self.build_body()
+        self.update_partition(self.last_data)
+        
     def setup_dragging(self):
         self.drag_position = None
         
@@ -1033,32 +2699,99 @@ class BaseFloatingWindow(QMainWindow):
             
     def set_data_manager(self, data_manager):
         self.data_manager = data_manager
+        self.schedule_time_tick()
+        
+    @METRICS.timed("ui update_data")
+    def update_partition(self, items, changed=None):
+        # changed 为变化的条目id列表，None 表示不知道哪些变了，需要逐条比较
+        self.last_data = items
+        style_config = self.get_style_config()
+        self.apply_window_style(style_config)
+        now = time.time()
+        visible = [(self.item_key(item), item) for item in items]
+        changed = None if changed is None else set(changed)
+        
+        if self.render_mode == "virtual":
+            self.update_model(visible, style_config, now, changed)
+            self.schedule_time_tick()
+            return
+            
+        visible_keys = {key for key, item in visible}
+        
+        destroyed = 0
+        for key in list(self.item_widgets):
+            if key not in visible_keys:
+                widget = self.item_widgets.pop(key)
+                self.content_layout.removeWidget(widget)
+                widget.deleteLater()
+                destroyed += 1
+                
+        created = 0
+        updated = 0
+        for index, (key, item) in enumerate(visible):
+            widget = self.item_widgets.get(key)
+            if widget is None:
+                widget = DataItemWidget(item, self.data_manager, style_config)
+                self.item_widgets[key] = widget
+                created += 1
+            elif (changed is None or key in changed or style_config is not widget.style_config) \
+                    and widget.update_item(item, style_config):
+                updated += 1
+            elif widget.time_boundary is not None and widget.time_boundary <= now:
+                widget.apply_time(now)
+                
+            if self.content_layout.indexOf(widget) != index:
+                self.content_layout.removeWidget(widget)
+                self.content_layout.insertWidget(index, widget)
+                
+        self.count_label.setText(str(len(visible)))
+        self.reconcile_stats = {"created": created, "updated": updated, "destroyed": destroyed}
+        ui_log.debug("%s窗口刷新: 新建%d 更新%d 删除%d", self.title, created, updated, destroyed)
+        self.schedule_time_tick()
+        
+    def update_model(self, visible, style_config, now, changed):
+        if self.item_delegate.set_style_config(style_config):
+            self.scroll_area.scheduleDelayedItemsLayout()
+        self.item_model.set_items(visible, now, changed)
+        self.count_label.setText(str(len(visible)))
+        
+    def next_time_boundary(self):
+        # 最近一条时间文字要变化的时间
+        if self.render_mode == "virtual":
+            boundaries = [boundary for boundary in self.item_model.boundaries if boundary is not None]
+        else:
+            boundaries = [widget.time_boundary for widget in self.item_widgets.values()
+                          if widget.time_boundary is not None]
+        return min(boundaries) if boundaries else None
         
-    def update_data(self, data):
-        self.clear_layout(self.content_layout)
+    def schedule_time_tick(self):
+        if self.data_manager is None:
+            return
+        scheduler = self.data_manager.scheduler
+        scheduler.cancel(self.time_job)
+        self.time_job = None
+        boundary = self.next_time_boundary()
+        if boundary is not None:
+            self.time_job = scheduler.call_later(boundary - time.time() + self.TIME_TICK_MARGIN, self.on_time_tick)
+            
+    def on_time_tick(self):
+        self.time_job = None
+        now = time.time()
+        if self.render_mode == "virtual":
+            self.item_model.refresh_times(now)
+        else:
+            for widget in self.item_widgets.values():
+                if widget.time_boundary is not None and widget.time_boundary <= now:
+                    widget.apply_time(now)
+        self.schedule_time_tick()
         
-        count = 0
-        for item in data:
-            if self.should_display_item(item):
-                widget = DataItemWidget(item, self.data_manager, self.get_style_config())
-                self.content_layout.insertWidget(count, widget)
-                count += 1
-                
-        self.count_label.setText(str(count))
+    def item_key(self, item):
+        return item.key
         
     def get_style_config(self):
         # 子类需要重写这个方法
-        return {}
-        
-    def should_display_item(self, item):
-        return True
+        return StyleConfig.get_default_style()
         
-    def clear_layout(self, layout):
-        while layout.count():
-            item = layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-                
     def toggle_collapse(self):
         if self.is_collapsed:
             self.expand()
@@ -1140,219 +2873,404 @@ class BaseFloatingWindow(QMainWindow):
         self.animation_group.finished.disconnect()
 
 class TaskFloatingWindow(BaseFloatingWindow):
+    partition = 'task'
+    
     def __init__(self, parent=None):
         super().__init__("任务", "#ff6b6b", parent)
         
-    def should_display_item(self, item):
-        return (item.get('type') == 'task' and 
-                not item.get('is_completed', False))
-                
     def get_style_config(self):
         return StyleConfig.get_task_style()
 
 class AssignmentFloatingWindow(BaseFloatingWindow):
+    partition = 'assignment'
+    
     def __init__(self, parent=None):
         super().__init__("作业", "#4ecdc4", parent)
         
-    def should_display_item(self, item):
-        return item.get('type') == 'assignment'
-        
     def get_style_config(self):
         return StyleConfig.get_assignment_style()
 
 class AnnouncementFloatingWindow(BaseFloatingWindow):
+    partition = 'announcement'
+    
     def __init__(self, parent=None):
         super().__init__("公告", "#45b7d1", parent)
         
-    def should_display_item(self, item):
-        if item.get('type') != 'announcement':
-            return False
-            
-        due_date_str = item.get('due_date', '')
-        is_long_term = item.get('is_long_term', False)
-        
-        if is_long_term:
-            return True
-            
-        if not due_date_str:
-            return True
-            
-        try:
-            due_date = datetime.strptime(due_date_str, "%Y-%m-%d %H:%M:%S")
-            return due_date >= datetime.now()
-        except ValueError:
-            return True
-            
     def get_style_config(self):
         return StyleConfig.get_announcement_style()
 
 class DataItemWidget(QFrame):
+    @METRICS.timed("ui DataItemWidget")
     def __init__(self, data, data_manager, style_config, parent=None):
         super().__init__(parent)
         self.data = data
         self.data_manager = data_manager
         self.style_config = style_config
+        # 时间文字下一次变化的时间戳，None 表示不会再变
+        self.time_boundary = None
         self.setup_ui()
         
     def setup_ui(self):
+        # 样式由所在窗口的 ITEM_STYLESHEET 统一提供
         self.setFrameStyle(QFrame.StyledPanel)
-        self.setStyleSheet("""
-            DataItemWidget {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 rgba(255,255,255,0.9),
-                    stop:1 rgba(250,250,250,0.9));
-                border-radius: 6px;
-                border: 1px solid #e0e0e0;
-                padding: 10px;
-            }
-            DataItemWidget:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 rgba(255,255,255,1),
-                    stop:1 rgba(245,245,245,1));
-                border: 1px solid #d0d0d0;
-            }
-        """)
         
-        layout = QVBoxLayout(self)
-        layout.setSpacing(5)
+        self.item_layout = QVBoxLayout(self)
+        self.item_layout.setSpacing(5)
         
-        title = self.data.get('title', '无标题')
-        self.title_label = QLabel(title)
-        title_font = QFont()
-        title_font.setPointSize(self.style_config.get('title_font_size', 10))
-        title_font.setBold(self.style_config.get('title_bold', True))
-        self.title_label.setFont(title_font)
+        self.title_label = QLabel()
+        self.title_label.setObjectName("itemTitle")
         self.title_label.setWordWrap(True)
-        self.title_label.setStyleSheet(f"color: {self.style_config.get('title_color', '#2c3e50')};")
-        layout.addWidget(self.title_label)
+        self.item_layout.addWidget(self.title_label)
+        
+        self.details_label = QLabel()
+        self.details_label.setObjectName("itemDetails")
+        self.details_label.setWordWrap(True)
+        self.item_layout.addWidget(self.details_label)
+        
+        self.action_bar = None
+        
+        self.time_label = QLabel()
+        self.time_label.setObjectName("itemTime")
+        self.item_layout.addWidget(self.time_label)
+        
+        self.apply_style()
+        self.apply_data()
+        
+    def apply_style(self):
+        self.title_label.setFont(self.style_config['title_font'])
+        self.details_label.setFont(self.style_config['content_font'])
+        self.time_label.setFont(self.style_config['time_font'])
+        
+    def apply_data(self):
+        self.title_label.setText(self.data.title)
         
         details = self.get_details_text()
-        if details:
-            self.details_label = QLabel(details)
-            details_font = QFont()
-            details_font.setPointSize(self.style_config.get('content_font_size', 8))
-            self.details_label.setFont(details_font)
-            self.details_label.setWordWrap(True)
-            self.details_label.setStyleSheet(f"color: {self.style_config.get('content_color', '#7f8c8d')}; margin-top: 3px;")
-            layout.addWidget(self.details_label)
-            
-        if self.data.get('type') == 'task' and not self.data.get('is_completed', False):
-            self.add_action_buttons(layout)
-            
-        time_text = self.get_time_text()
-        if time_text:
-            time_label = QLabel(time_text)
-            time_font = QFont()
-            time_font.setPointSize(self.style_config.get('time_font_size', 7))
-            time_label.setFont(time_font)
-            time_label.setStyleSheet(f"color: {self.style_config.get('time_color', '#95a5a6')}; margin-top: 6px;")
-            layout.addWidget(time_label)
+        self.details_label.setText(details)
+        self.details_label.setVisible(bool(details))
+        
+        show_actions = self.data.kind == 'task' and not self.data.is_completed
+        if show_actions and self.action_bar is None:
+            self.add_action_buttons(self.item_layout)
+        if self.action_bar is not None:
+            self.action_bar.setVisible(show_actions)
+            
+        self.apply_time(time.time())
+        
+    def apply_time(self, now):
+        time_text, self.time_boundary = self.time_bucket(self.data, now)
+        self.time_label.setText(time_text)
+        self.time_label.setVisible(bool(time_text))
+        
+    def update_item(self, data, style_config):
+        # 原地更新已有控件，返回是否有变化；样式来自缓存，同一份配置是同一个对象
+        if data == self.data and style_config is self.style_config:
+            return False
+            
+        if style_config is not self.style_config:
+            self.style_config = style_config
+            self.apply_style()
+        self.data = data
+        self.apply_data()
+        return True
             
     def get_details_text(self):
-        item_type = self.data.get('type', '')
+        item_type = self.data.kind
         
         if item_type == 'task':
-            desc = self.data.get('description', '无描述')
-            priority = self.data.get('priority', 1)
-            priority_text = {1: "低", 2: "中", 3: "高"}.get(priority, "未知")
-            return f"优先级: {priority_text}\n{desc}"
+            return f"优先级: {priority_text(self.data.priority)}\n{self.data.description}"
             
         elif item_type == 'assignment':
-            subject = self.data.get('subject', '无科目')
-            desc = self.data.get('description', '无描述')
-            subject_text = f"<span style='color: {self.style_config.get('subject_color', '#7f8c8d')}; font-size: {self.style_config.get('subject_font_size', 8)}px;'>科目: {subject}</span><br>{desc}"
+            subject_text = f"<span style='color: {self.style_config.get('subject_color', '#7f8c8d')}; font-size: {self.style_config.get('subject_font_size', 8)}px;'>科目: {self.data.subject}</span><br>{self.data.description}"
             return subject_text
             
         elif item_type == 'announcement':
-            return self.data.get('content', '无内容')
+            return self.data.content
             
         return ""
         
     def get_time_text(self):
-        due_date = self.data.get('due_date', '')
-        created_at = self.data.get('created_at', '')
+        return self.time_text_for(self.data)
         
-        if due_date:
-            try:
-                due_dt = datetime.strptime(due_date, "%Y-%m-%d %H:%M:%S")
-                now = datetime.now()
-                if due_dt > now:
-                    delta = due_dt - now
-                    if delta.days > 0:
-                        return f"剩余 {delta.days} 天"
-                    else:
-                        hours = delta.seconds // 3600
-                        return f"剩余 {hours} 小时"
-                else:
-                    return "已过期"
-            except:
-                pass
-                
-        if created_at:
-            try:
-                created_dt = datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S")
-                return f"创建于 {created_dt.strftime('%m-%d %H:%M')}"
-            except:
-                pass
-                
-        return ""
+    @staticmethod
+    def time_text_for(data):
+        return DataItemWidget.time_bucket(data, time.time())[0]
+        
+    @staticmethod
+    def time_bucket(data, now):
+        # 返回显示的文字和文字下一次变化的时间戳，之后不会再变时为 None
+        due_ts = data.due_ts
+        if due_ts is not None:
+            remaining = due_ts - now
+            if remaining <= 0:
+                return "已过期", None
+            days = int(remaining // 86400)
+            if days > 0:
+                return f"剩余 {days} 天", due_ts - days * 86400
+            hours = int(remaining // 3600)
+            return f"剩余 {hours} 小时", due_ts - hours * 3600
+            
+        created_ts = data.created_ts
+        if created_ts is not None:
+            return f"创建于 {datetime.fromtimestamp(created_ts).strftime('%m-%d %H:%M')}", None
+            
+        return "", None
         
     def add_action_buttons(self, layout):
-        btn_layout = QHBoxLayout()
+        self.action_bar = QWidget()
+        btn_layout = QHBoxLayout(self.action_bar)
+        btn_layout.setContentsMargins(0, 0, 0, 0)
         
         ack_btn = AnimatedButton("确认")
+        ack_btn.setObjectName("ackButton")
         ack_btn.setFixedHeight(24)
-        ack_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #3498db, stop:1 #2980b9);
-                color: white;
-                border: none;
-                border-radius: 4px;
-                font-weight: bold;
-                padding: 4px 8px;
-                font-size: 9px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #3cb0fd, stop:1 #3498db);
-            }
-        """)
         ack_btn.clicked.connect(self.on_acknowledge)
         
         complete_btn = AnimatedButton("完成")
+        complete_btn.setObjectName("completeButton")
         complete_btn.setFixedHeight(24)
-        complete_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #2ecc71, stop:1 #27ae60);
-                color: white;
-                border: none;
-                border-radius: 4px;
-                font-weight: bold;
-                padding: 4px 8px;
-                font-size: 9px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #58d68d, stop:1 #2ecc71);
-            }
-        """)
         complete_btn.clicked.connect(self.on_complete)
         
         btn_layout.addWidget(ack_btn)
         btn_layout.addWidget(complete_btn)
         btn_layout.addStretch()
         
-        layout.addLayout(btn_layout)
+        layout.insertWidget(layout.indexOf(self.time_label), self.action_bar)
         
     def on_acknowledge(self):
         if self.data_manager:
-            self.data_manager.acknowledge_task(self.data['id'])
+            self.data_manager.acknowledge_task(self.data.id)
         
     def on_complete(self):
         if self.data_manager:
-            self.data_manager.complete_task(self.data['id'])
+            self.data_manager.complete_task(self.data.id)
+
+# 大量数据时使用的列表模型：只保存数据，不为每条数据创建控件
+class BoardItemModel(QAbstractListModel):
+    ItemRole = Qt.UserRole + 1
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.keys = []
+        self.items = []
+        # 每行时间文字下一次变化的时间戳
+        self.boundaries = []
+        
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.items)
+        
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        item = self.items[index.row()]
+        if role == self.ItemRole:
+            return item
+        if role == Qt.DisplayRole:
+            return item.title
+        return None
+        
+    def set_items(self, visible, now, changed=None):
+        keys = [key for key, item in visible]
+        items = [item for key, item in visible]
+        boundaries = [DataItemWidget.time_bucket(item, now)[1] for item in items]
+        
+        # 行没有增删时只通知变化的行，避免整表重置丢失滚动位置
+        if keys == self.keys:
+            for row, (key, item) in enumerate(visible):
+                if changed is None:
+                    item_changed = item != self.items[row]
+                else:
+                    item_changed = key in changed
+                if item_changed or (self.boundaries[row] is not None and self.boundaries[row] <= now):
+                    self.items[row] = item
+                    index = self.index(row)
+                    self.dataChanged.emit(index, index)
+            self.boundaries = boundaries
+            return
+            
+        self.beginResetModel()
+        self.keys = keys
+        self.items = items
+        self.boundaries = boundaries
+        self.endResetModel()
+        
+    def refresh_times(self, now):
+        # 只重绘时间文字已经变化的行，委托绘制时会按当前时间重新生成文字
+        for row, boundary in enumerate(self.boundaries):
+            if boundary is not None and boundary <= now:
+                self.boundaries[row] = DataItemWidget.time_bucket(self.items[row], now)[1]
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+
+# 行高取决于视口宽度（文字换行），宽度变化（如出现滚动条）时重新排版，否则行底部会被截掉
+class BoardListView(QListView):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.layout_width = None
+        
+    def viewportEvent(self, event):
+        if event.type() == QEvent.Resize and self.viewport().width() != self.layout_width:
+            self.layout_width = self.viewport().width()
+            self.scheduleDelayedItemsLayout()
+        return super().viewportEvent(event)
+
+# 列表委托：绘制条目卡片，并自己处理确认/完成按钮的点击
+class BoardItemDelegate(QStyledItemDelegate):
+    PADDING = 10
+    SPACING = 5
+    BUTTON_WIDTH = 48
+    BUTTON_HEIGHT = 24
+    
+    def __init__(self, window):
+        super().__init__(window)
+        self.window = window
+        self.style_config = None
+        self.fonts = {}
+        self.hover_pos = None
+        self.button_font = QFont()
+        self.button_font.setPixelSize(9)
+        self.button_font.setBold(True)
+        self.set_style_config(window.get_style_config())
+        
+    def set_style_config(self, style_config):
+        if style_config is self.style_config:
+            return False
+            
+        self.style_config = style_config
+        self.fonts = {
+            'title': style_config['title_font'],
+            'details': style_config['content_font'],
+            'time': style_config['time_font'],
+            'button': self.button_font
+        }
+        return True
+        
+    def details_text(self, item):
+        item_type = item.kind
+        if item_type == 'task':
+            return f"优先级: {priority_text(item.priority)}\n{item.description}"
+        elif item_type == 'assignment':
+            return f"科目: {item.subject}\n{item.description}"
+        elif item_type == 'announcement':
+            return item.content
+        return ""
+        
+    def text_height(self, font, width, text):
+        metrics = QFontMetrics(font)
+        return metrics.boundingRect(QRect(0, 0, width, 100000), Qt.TextWordWrap, text).height()
+        
+    def layout_item(self, item, rect):
+        # 计算各部分的位置，绘制和点击判断共用同一套布局
+        x = rect.x() + self.PADDING
+        y = rect.y() + self.PADDING
+        width = max(rect.width() - self.PADDING * 2, 10)
+        parts = []
+        
+        title = item.title
+        height = self.text_height(self.fonts['title'], width, title)
+        parts.append(('title', QRect(x, y, width, height), title))
+        y += height + self.SPACING
+        
+        details = self.details_text(item)
+        if details:
+            y += 3
+            height = self.text_height(self.fonts['details'], width, details)
+            parts.append(('details', QRect(x, y, width, height), details))
+            y += height + self.SPACING
+            
+        if item.kind == 'task' and not item.is_completed:
+            parts.append(('acknowledge', QRect(x, y, self.BUTTON_WIDTH, self.BUTTON_HEIGHT), "确认"))
+            parts.append(('complete', QRect(x + self.BUTTON_WIDTH + 6, y, self.BUTTON_WIDTH, self.BUTTON_HEIGHT), "完成"))
+            y += self.BUTTON_HEIGHT + self.SPACING
+            
+        time_text = DataItemWidget.time_text_for(item)
+        if time_text:
+            y += 6
+            height = self.text_height(self.fonts['time'], width, time_text)
+            parts.append(('time', QRect(x, y, width, height), time_text))
+            y += height + self.SPACING
+            
+        return parts, y - self.SPACING + self.PADDING - rect.y()
+        
+    def sizeHint(self, option, index):
+        width = self.window.scroll_area.viewport().width() - self.window.scroll_area.spacing() * 2
+        item = index.data(BoardItemModel.ItemRole)
+        parts, height = self.layout_item(item, QRect(0, 0, width, 0))
+        return QSize(width, height)
+        
+    def paint(self, painter, option, index):
+        item = index.data(BoardItemModel.ItemRole)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        
+        card = option.rect.adjusted(0, 0, -1, -1)
+        gradient = QLinearGradient(card.left(), 0, card.right(), 0)
+        if hovered:
+            gradient.setColorAt(0, QColor(255, 255, 255))
+            gradient.setColorAt(1, QColor(245, 245, 245))
+            painter.setPen(QPen(QColor("#d0d0d0")))
+        else:
+            gradient.setColorAt(0, QColor(255, 255, 255, 230))
+            gradient.setColorAt(1, QColor(250, 250, 250, 230))
+            painter.setPen(QPen(QColor("#e0e0e0")))
+        painter.setBrush(QBrush(gradient))
+        painter.drawRoundedRect(card, 6, 6)
+        
+        colors = {
+            'title': self.style_config['title_color'],
+            'details': self.style_config['content_color'],
+            'time': self.style_config['time_color']
+        }
+        button_colors = {
+            'acknowledge': ("#3498db", "#2980b9", "#3cb0fd"),
+            'complete': ("#2ecc71", "#27ae60", "#58d68d")
+        }
+        
+        parts, height = self.layout_item(item, option.rect)
+        for kind, rect, text in parts:
+            if kind in button_colors:
+                start, stop, hover_start = button_colors[kind]
+                button_hovered = self.hover_pos is not None and rect.contains(self.hover_pos)
+                button_gradient = QLinearGradient(rect.left(), 0, rect.right(), 0)
+                button_gradient.setColorAt(0, QColor(hover_start if button_hovered else start))
+                button_gradient.setColorAt(1, QColor(start if button_hovered else stop))
+                painter.setPen(Qt.NoPen)
+                painter.setBrush(QBrush(button_gradient))
+                painter.drawRoundedRect(rect, 4, 4)
+                painter.setPen(QPen(Qt.white))
+                painter.setFont(self.fonts['button'])
+                painter.drawText(rect, Qt.AlignCenter, text)
+            else:
+                painter.setPen(QPen(QColor(colors[kind])))
+                painter.setFont(self.fonts[kind])
+                painter.drawText(rect, Qt.TextWordWrap, text)
+                
+        painter.restore()
+        
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseMove:
+            self.hover_pos = event.position().toPoint()
+            self.window.scroll_area.viewport().update(option.rect)
+            return False
+            
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            item = index.data(BoardItemModel.ItemRole)
+            parts, height = self.layout_item(item, option.rect)
+            pos = event.position().toPoint()
+            for kind, rect, text in parts:
+                if kind in ('acknowledge', 'complete') and rect.contains(pos):
+                    data_manager = self.window.data_manager
+                    if data_manager:
+                        if kind == 'acknowledge':
+                            data_manager.acknowledge_task(item.id)
+                        else:
+                            data_manager.complete_task(item.id)
+                    return True
+                    
+        return super().editorEvent(event, model, option, index)
 
 # WinUI风格的设置对话框
 class SettingsDialog(QDialog):
@@ -1593,8 +3511,13 @@ class SettingsDialog(QDialog):
         opacity_layout.addWidget(self.opacity_label)
         self.opacity_slider.valueChanged.connect(self.on_opacity_changed)
         
+        self.render_mode_combo = QComboBox()
+        self.render_mode_combo.addItem("标准控件", "widgets")
+        self.render_mode_combo.addItem("虚拟列表 (适合大量数据)", "virtual")
+        
         window_layout.addRow("窗口层级:", self.window_level_combo)
         window_layout.addRow("窗口不透明度:", opacity_layout)
+        window_layout.addRow("渲染模式:", self.render_mode_combo)
         
         layout.addWidget(window_group)
         
@@ -1776,6 +3699,8 @@ class SettingsDialog(QDialog):
         self.secret_key_edit.setText(settings.value("secret_key", ""))
         self.window_level_combo.setCurrentIndex(settings.value("window_level", 0, type=int))
         self.opacity_slider.setValue(settings.value("opacity", 90, type=int))
+        render_index = self.render_mode_combo.findData(settings.value("render_mode", "widgets"))
+        self.render_mode_combo.setCurrentIndex(max(render_index, 0))
         self.notify_new.setChecked(settings.value("notify_new", True, type=bool))
         self.notify_task.setChecked(settings.value("notify_task", True, type=bool))
         self.notify_sound.setChecked(settings.value("notify_sound", True, type=bool))
@@ -1818,6 +3743,7 @@ class SettingsDialog(QDialog):
         settings.setValue("secret_key", secret_key)
         settings.setValue("window_level", self.window_level_combo.currentIndex())
         settings.setValue("opacity", self.opacity_slider.value())
+        settings.setValue("render_mode", self.render_mode_combo.currentData())
         settings.setValue("notify_new", self.notify_new.isChecked())
         settings.setValue("notify_task", self.notify_task.isChecked())
         settings.setValue("notify_sound", self.notify_sound.isChecked())
@@ -1846,6 +3772,7 @@ class SettingsDialog(QDialog):
         style_settings.setValue("announcement_content_font_size", self.announcement_content_size.value())
         style_settings.setValue("announcement_content_color", self.announcement_content_color.text())
         style_settings.setValue("announcement_title_bold", self.announcement_title_bold.isChecked())
+        StyleConfig.invalidate()
         
         self.api_client.setup(SERVER, board_id, secret_key)
         QMessageBox.information(self, "成功", "设置已保存")
@@ -1871,78 +3798,324 @@ class SettingsDialog(QDialog):
         except Exception as e:
             QMessageBox.critical(self, "连接错误", f"连接过程中发生错误: {str(e)}")
 
-class WindowManager:
-    def __init__(self):
-        self.data_manager = DataManager()
-        self.windows = {}
-        self.tray_icon = None
+# 诊断信息：各热点路径的耗时分布、次数和错误率，每秒刷新
+class MetricsDialog(QDialog):
+    def __init__(self, metrics, parent=None):
+        super().__init__(parent)
+        self.metrics = metrics
+        self.setWindowTitle("诊断信息")
+        self.resize(880, 420)
         
-        self.setup_windows()
-        self.setup_tray()
-        self.connect_signals()
-        self.load_settings()
+        layout = QVBoxLayout(self)
+        self.text = QTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setLineWrapMode(QTextEdit.NoWrap)
+        self.text.setFont(QFont("Consolas", 9))
+        layout.addWidget(self.text)
         
-    def setup_windows(self):
-        self.windows['task'] = TaskFloatingWindow()
-        self.windows['assignment'] = AssignmentFloatingWindow()
-        self.windows['announcement'] = AnnouncementFloatingWindow()
+        button_layout = QHBoxLayout()
+        export_btn = QPushButton("导出JSON")
+        export_btn.clicked.connect(self.export_json)
+        clear_btn = QPushButton("清空")
+        clear_btn.clicked.connect(self.clear_metrics)
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(self.close)
+        button_layout.addWidget(export_btn)
+        button_layout.addWidget(clear_btn)
+        button_layout.addStretch()
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
         
-        for window in self.windows.values():
-            window.set_data_manager(self.data_manager)
+        self.timer = QTimer(self)
+        self.timer.setInterval(1000)
+        self.timer.timeout.connect(self.refresh)
+        self.refresh()
+        
+    def showEvent(self, event):
+        self.timer.start()
+        super().showEvent(event)
+        
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+        
+    def refresh(self):
+        lines = [f"{'指标':<52}{'次数':>8}{'错误率':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}"]
+        for name, stats in self.metrics.snapshot().items():
+            def fmt(value):
+                return "-" if value is None else f"{value:.1f}"
+            lines.append(f"{name:<52}{stats['count']:>8}{stats['error_rate']:>8.1%}"
+                         f"{fmt(stats['p50_ms']):>10}{fmt(stats['p95_ms']):>10}"
+                         f"{fmt(stats['p99_ms']):>10}{fmt(stats['max_ms']):>10}")
+        if len(lines) == 1:
+            lines.append("暂无数据")
+        if self.metrics.counters:
+            lines.append("")
+            lines.append(f"{'计数':<52}{'值':>8}")
+            for name, value in sorted(self.metrics.counters.items()):
+                lines.append(f"{name:<52}{value:>8}")
+        lines.append("")
+        lines.append(f"耗时单位为毫秒，分位数基于每项最近{self.metrics.window}个样本")
+        
+        scroll = self.text.verticalScrollBar().value()
+        self.text.setPlainText("\n".join(lines))
+        self.text.verticalScrollBar().setValue(scroll)
+        
+    def export_json(self):
+        folder = QStandardPaths.writableLocation(QStandardPaths.DocumentsLocation)
+        default = os.path.join(folder, datetime.now().strftime("dlass-metrics-%Y%m%d-%H%M%S.json"))
+        path, _ = QFileDialog.getSaveFileName(self, "导出诊断数据", default, "JSON (*.json)")
+        if not path:
+            return
+        try:
+            self.metrics.export(path)
+        except OSError as e:
+            QMessageBox.warning(self, "导出失败", str(e))
             
-    def setup_tray(self):
-        self.tray_icon = QSystemTrayIcon()
-        self.tray_icon.setIcon(self.create_tray_icon())
-        
-        tray_menu = QMenu()
-        
-        window_menu = QMenu("窗口控制", tray_menu)
-        
-        show_all_action = QAction("显示所有窗口", window_menu)
-        show_all_action.triggered.connect(self.show_all_windows)
-        
-        hide_all_action = QAction("隐藏所有窗口", window_menu)
-        hide_all_action.triggered.connect(self.hide_all_windows)
-        
-        collapse_all_action = QAction("收起所有窗口", window_menu)
-        collapse_all_action.triggered.connect(self.collapse_all_windows)
-        
-        expand_all_action = QAction("展开所有窗口", window_menu)
-        expand_all_action.triggered.connect(self.expand_all_windows)
-        
-        window_menu.addAction(show_all_action)
-        window_menu.addAction(hide_all_action)
-        window_menu.addSeparator()
-        window_menu.addAction(collapse_all_action)
-        window_menu.addAction(expand_all_action)
-        window_menu.addSeparator()
-        
-        for name, window in self.windows.items():
-            action = QAction(f"显示{window.title}窗口", window_menu)
-            action.triggered.connect(lambda checked, w=window: w.show())
-            window_menu.addAction(action)
+    def clear_metrics(self):
+        self.metrics.clear()
+        self.refresh()
+
+# 通知队列：按级别限速，按条目去重，短时间内相同的提醒合并成一条。
+# 系统级提醒用弹窗显示但不阻塞事件循环，同一时间只弹一个，其余排队等它关闭
+class NotificationQueue(QObject):
+    # 级别 -> (时间窗口内最多显示几条, 时间窗口秒数)
+    RATE_LIMITS = {1: (4, 10), 2: (4, 10), 3: (1, 3)}
+    TRAY_STYLES = {
+        1: (QSystemTrayIcon.Information, 5000),
+        2: (QSystemTrayIcon.Warning, 7000),
+        3: (QSystemTrayIcon.Critical, 10000)
+    }
+    popup_closed = Signal()
+    popup_failed = Signal(str, str)
+    
+    def __init__(self, tray_icon, max_depth=50, dedup_window=30, parent=None):
+        super().__init__(parent)
+        self.tray_icon = tray_icon
+        self.max_depth = max_depth
+        # 同一条目的同级提醒在这段时间内只显示一次
+        self.dedup_window = dedup_window
+        self.queue = []
+        self.recent = {}
+        self.shown_at = {level: collections.deque() for level in self.RATE_LIMITS}
+        self.popup = None
+        self.popup_open = False
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.pump)
+        self.popup_closed.connect(self.on_popup_closed)
+        self.popup_failed.connect(self.on_popup_failed)
+        self.reload_settings()
+        
+    def reload_settings(self):
+        # 设置只在保存后才重新读取，不再每条通知都读一次QSettings
+        settings = QSettings("WhiteboardClient", "Config")
+        self.notify_enabled = settings.value("notify_new", True, type=bool)
+        self.system_level_enabled = settings.value("system_level_notify", True, type=bool)
+        
+    def post(self, title, content, level, key=""):
+        if level not in self.RATE_LIMITS:
+            level = 1
+        if not self.notify_enabled or (level == 3 and not self.system_level_enabled):
+            METRICS.count("notify disabled")
+            return
             
-        tray_menu.addMenu(window_menu)
-        
-        settings_action = QAction("设置", tray_menu)
-        settings_action.triggered.connect(self.show_settings)
-        tray_menu.addAction(settings_action)
-        
-        refresh_action = QAction("刷新数据", tray_menu)
-        refresh_action.triggered.connect(self.data_manager.manual_refresh)
-        tray_menu.addAction(refresh_action)
-        
-        tray_menu.addSeparator()
+        key = key or f"{title}\n{content}"
+        now = time.monotonic()
+        for entry in self.queue:
+            if entry['key'] == key and entry['level'] == level:
+                # 还在排队：合并成一条，显示最新的内容
+                entry['title'] = title
+                entry['content'] = content
+                entry['repeats'] += 1
+                METRICS.count("notify coalesced")
+                return
+                
+        shown = self.recent.get((level, key))
+        if shown is not None and now - shown < self.dedup_window:
+            METRICS.count("notify coalesced")
+            return
+            
+        if len(self.queue) >= self.max_depth:
+            # 队列满时丢掉级别最低、排队最久的一条；新通知级别更低就丢掉它自己
+            victim = min(self.queue, key=lambda entry: (entry['level'], entry['queued_at']))
+            METRICS.count("notify dropped")
+            if level < victim['level']:
+                return
+            self.queue.remove(victim)
+            
+        self.queue.append({
+            'title': title,
+            'content': content,
+            'level': level,
+            'key': key,
+            'repeats': 0,
+            'queued_at': now
+        })
+        self.pump()
+        
+    def rate_delay(self, level, now):
+        # 返回还要等多久才能再显示这个级别的通知
+        limit, window = self.RATE_LIMITS[level]
+        shown = self.shown_at[level]
+        while shown and now - shown[0] >= window:
+            shown.popleft()
+        if len(shown) < limit:
+            return 0
+        return window - (now - shown[0])
+        
+    def pump(self):
+        now = time.monotonic()
+        wait = None
+        # 级别高的先显示，同级按到达顺序
+        for entry in sorted(self.queue, key=lambda entry: -entry['level']):
+            if entry['level'] == 3 and self.popup_open:
+                continue
+            delay = self.rate_delay(entry['level'], now)
+            if delay > 0:
+                wait = delay if wait is None else min(wait, delay)
+                continue
+            self.queue.remove(entry)
+            self.show(entry, now)
+            
+        METRICS.gauge("notify queue_depth", len(self.queue))
+        if wait is not None:
+            self.timer.start(int(wait * 1000) + 1)
+            
+    def show(self, entry, now):
+        level = entry['level']
+        self.shown_at[level].append(now)
+        self.recent[(level, entry['key'])] = now
+        if len(self.recent) > 256:
+            self.recent = {key: shown for key, shown in self.recent.items() if now - shown < self.dedup_window}
+        METRICS.record("notify queue_wait", (now - entry['queued_at']) * 1000)
+        METRICS.count(f"notify shown level{level}")
+        
+        content = entry['content']
+        if entry['repeats']:
+            content += f"\n（合并了{entry['repeats']}条相同的提醒）"
+        if level == 3:
+            self.show_popup(entry['title'], content)
+        else:
+            self.show_tray_message(entry['title'], content, level)
+            
+    def show_tray_message(self, title, content, level):
+        icon, duration = self.TRAY_STYLES[level]
+        self.tray_icon.showMessage(title, content, icon, duration)
+        ui_log.debug("系统通知已发送，级别: %s", level)
+        
+    def show_popup(self, title, content):
+        self.popup_open = True
+        if sys.platform == "win32":
+            # MessageBoxW 会一直阻塞到用户点确定，放到单独的线程里，事件循环照常运行
+            threading.Thread(target=self.run_message_box, args=(title, content), daemon=True).start()
+            return
+            
+        box = QMessageBox(QMessageBox.Warning, f"系统警告 - {title}", f"{content}\n\n此消息需要您确认。",
+                          QMessageBox.Ok)
+        box.setWindowFlags(box.windowFlags() | Qt.WindowStaysOnTopHint)
+        box.setAttribute(Qt.WA_DeleteOnClose)
+        box.finished.connect(lambda result: self.on_popup_closed())
+        box.open()
+        self.popup = box
+        
+    def run_message_box(self, title, content):
+        # 在弹窗线程里执行，只能通过信号回到GUI线程
+        try:
+            import ctypes
+            # MB_SYSTEMMODAL | MB_ICONWARNING | MB_OK：系统模态，置顶在所有窗口之上
+            result = ctypes.windll.user32.MessageBoxW(
+                0,
+                f"{content}\n\n此消息需要您确认。",
+                f"系统警告 - {title}",
+                0x00001000 | 0x00000030 | 0x00000000
+            )
+            if result == 1:  # IDOK
+                ui_log.info("用户确认了系统警告")
+            else:
+                ui_log.info("系统警告返回代码: %s", result)
+        except Exception as e:
+            ui_log.warning("显示 Windows 弹窗失败: %s", e)
+            self.popup_failed.emit(title, content)
+        finally:
+            self.popup_closed.emit()
+            
+    def on_popup_failed(self, title, content):
+        # 弹窗失败时回退到托盘通知
+        self.show_tray_message(title, content, 3)
+        
+    def on_popup_closed(self):
+        self.popup = None
+        self.popup_open = False
+        self.pump()
+
+# 窗口第一次绘制时回调一次，用来在首帧之后再启动网络服务
+class FirstPaintFilter(QObject):
+    def __init__(self, callback, parent=None):
+        super().__init__(parent)
+        self.callback = callback
         
-        quit_action = QAction("退出", tray_menu)
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and self.callback:
+            callback, self.callback = self.callback, None
+            QTimer.singleShot(0, callback)
+        return False
+
+# 所有白板共用的托盘：主白板的菜单项放在顶层（和只有一个白板时一样），其他白板各占一个子菜单；
+# 通知也走同一个队列，限速按整个托盘计算
+class BoardTray:
+    def __init__(self, hub):
+        self.hub = hub
+        self.managers = []
+        self.statuses = {}
+        self.metrics_dialog = None
+        
+        self.icon = QSystemTrayIcon()
+        self.icon.setIcon(self.create_icon())
+        self.menu = QMenu()
+        
+        # 各白板的菜单项都插在“诊断信息”之前
+        self.metrics_action = QAction("诊断信息", self.menu)
+        self.metrics_action.triggered.connect(self.show_metrics)
+        self.menu.addAction(self.metrics_action)
+        
+        self.menu.addSeparator()
+        
+        quit_action = QAction("退出", self.menu)
         quit_action.triggered.connect(self.quit_application)
-        tray_menu.addAction(quit_action)
+        self.menu.addAction(quit_action)
+        
+        self.icon.setContextMenu(self.menu)
+        self.icon.activated.connect(self.on_activated)
+        self.notifications = NotificationQueue(self.icon)
+        self.icon.show()
+        
+    def add_board(self, manager):
+        self.managers.append(manager)
+        parent = self.menu if manager.board is None else QMenu(manager.board_name(), self.menu)
+        actions = [manager.create_window_menu(parent).menuAction()]
+        
+        # 设置只对应主白板
+        if manager.board is None:
+            settings_action = QAction("设置", parent)
+            settings_action.triggered.connect(manager.show_settings)
+            actions.append(settings_action)
+            
+        refresh_action = QAction("刷新数据", parent)
+        refresh_action.triggered.connect(manager.data_manager.manual_refresh)
+        actions.append(refresh_action)
         
-        self.tray_icon.setContextMenu(tray_menu)
-        self.tray_icon.activated.connect(self.on_tray_activated)
-        self.tray_icon.show()
+        if parent is self.menu:
+            self.menu.insertActions(self.metrics_action, actions)
+        else:
+            parent.addActions(actions)
+            self.menu.insertMenu(self.metrics_action, parent)
+            
+    def set_status(self, manager, text):
+        self.statuses[manager] = text
+        self.icon.setToolTip("\n".join(self.statuses[m] for m in self.managers if m in self.statuses))
         
-    def create_tray_icon(self):
+    def create_icon(self):
         pixmap = QPixmap(64, 64)
         pixmap.fill(Qt.transparent)
         
@@ -1964,196 +4137,67 @@ class WindowManager:
         painter.end()
         return QIcon(pixmap)
         
-    def connect_signals(self):
-        self.data_manager.data_updated.connect(self.on_data_updated)
-        self.data_manager.error_occurred.connect(self.show_error)
-        self.data_manager.system_notification.connect(self.show_system_notification)
-        self.data_manager.socketio_status.connect(self.on_socketio_status)
-        print("所有信号已连接")
-        
-    def show_system_notification(self, title, content, level):
-        print(f"触发系统通知: {title} - {content}, 级别: {level}")
-        
-        settings = QSettings("WhiteboardClient", "Config")
-        
-        # 检查是否启用了系统级通知
-        system_level_enabled = settings.value("system_level_notify", True, type=bool)
-        
-        # 根据级别决定是否显示通知
-        if level == 3 and not system_level_enabled:
-            print("系统级通知已禁用")
-            return
-            
-        # 检查基本通知设置
-        notify_enabled = settings.value("notify_new", True, type=bool)
-        
-        print(f"通知设置状态: {notify_enabled}")
-        
-        if notify_enabled:
-            if level == 3:  # 系统级警告 - 使用 Windows 弹窗
-                self.show_windows_message_box(title, content)
-                print(f"Windows 弹窗已发送，级别: {level}")
-            else:  # 普通通知 - 使用系统托盘通知
-                # 根据级别设置不同的图标和持续时间
-                if level == 2:  # 警告
-                    icon = QSystemTrayIcon.Warning
-                    duration = 7000  # 7秒
-                else:  # 普通信息
-                    icon = QSystemTrayIcon.Information
-                    duration = 5000  # 5秒
+    def on_activated(self, reason):
+        if reason == QSystemTrayIcon.DoubleClick:
+            any_visible = any(window.isVisible() for manager in self.managers for window in manager.windows.values())
+            for manager in self.managers:
+                if any_visible:
+                    manager.hide_all_windows()
+                else:
+                    manager.show_all_windows()
                     
-                self.tray_icon.showMessage(
-                    title, 
-                    content, 
-                    icon, 
-                    duration
-                )
-                print(f"系统托盘通知已发送，级别: {level}")
-    
-    def show_windows_message_box(self, title, content):
-        """
-        显示 Windows 底层消息弹窗
-        类似 shutdown /t 10 的那种强制弹窗
-        """
-        try:
-            # 使用 MB_SYSTEMMODAL | MB_ICONWARNING | MB_OK 来创建系统级模态对话框
-            # MB_SYSTEMMODAL: 系统模态，会置顶在所有窗口之上
-            # MB_ICONWARNING: 警告图标
-            # MB_OK: 确定按钮
-            
-            result = ctypes.windll.user32.MessageBoxW(
-                0,  # 没有父窗口
-                f"{content}\n\n此消息需要您确认。",  # 消息内容
-                f"系统警告 - {title}",  # 标题
-                0x00001000 | 0x00000030 | 0x00000000  # MB_SYSTEMMODAL | MB_ICONWARNING | MB_OK
-            )
-            
-            # 可选：记录用户响应
-            if result == 1:  # IDOK
-                print("用户确认了系统警告")
-            else:
-                print(f"系统警告返回代码: {result}")
-                
-        except Exception as e:
-            print(f"显示 Windows 弹窗失败: {e}")
-            # 失败时回退到系统托盘通知
-            self.tray_icon.showMessage(
-                title, 
-                content, 
-                QSystemTrayIcon.Critical, 
-                10000
-            )
-            
-    def on_socketio_status(self, connected, message):
-        status = "已连接" if connected else "未连接"
-        print(f"Socket.IO状态: {status} - {message}")
-        
-        if connected:
-            self.tray_icon.setToolTip(f"白板客户端 - Socket.IO已连接")
-        else:
-            self.tray_icon.setToolTip(f"白板客户端 - Socket.IO未连接: {message}")
-            
-    def on_data_updated(self, data):
-        for window in self.windows.values():
-            window.update_data(data)
-            
-    def show_error(self, error_msg):
-        self.tray_icon.showMessage("错误", error_msg, QSystemTrayIcon.Critical, 3000)
-        
-    def load_settings(self):
-        settings = QSettings("WhiteboardClient", "Config")
-        board_id = settings.value("board_id", "")
-        secret_key = settings.value("secret_key", "")
-        window_level = settings.value("window_level", 0, type=int)
-        opacity = settings.value("opacity", 90, type=int)
-        
-        for window in self.windows.values():
-            if window_level == 1:
-                window.setWindowFlags(window.windowFlags() | Qt.WindowStaysOnTopHint)
-            elif window_level == 2:
-                window.setWindowFlags(window.windowFlags() | Qt.WindowStaysOnBottomHint)
-                
-            window.setWindowOpacity(opacity / 100.0)
-            
-        if board_id and secret_key:
-            self.data_manager.setup(SERVER, board_id, secret_key)
-            self.data_manager.start_data_fetching()
-            self.data_manager.start_heartbeat()
-            self.data_manager.start_socketio()
-            print("所有服务已启动")
-            
-        self.arrange_windows()
-        
-    def arrange_windows(self):
-        screen_geometry = QGuiApplication.primaryScreen().geometry()
-        
-        window_width = 300
-        window_height = 400
-        spacing = 10
-        total_width = (window_width * 3) + (spacing * 2)
-        
-        start_x = (screen_geometry.width() - total_width) // 2
-        y_pos = 50
-        
-        positions = {
-            'task': (start_x, y_pos),
-            'assignment': (start_x + window_width + spacing, y_pos),
-            'announcement': (start_x + (window_width + spacing) * 2, y_pos)
-        }
+    def show_metrics(self):
+        if self.metrics_dialog is None:
+            self.metrics_dialog = MetricsDialog(METRICS)
+        self.metrics_dialog.show()
+        self.metrics_dialog.raise_()
         
-        for name, window in self.windows.items():
-            pos = positions.get(name, (0, 0))
-            window.move(pos[0], pos[1])
-            
-    def show_all_windows(self):
-        for window in self.windows.values():
-            window.show()
-            window.raise_()
-            
-    def hide_all_windows(self):
-        for window in self.windows.values():
-            window.hide()
-            
-    def collapse_all_windows(self):
-        for window in self.windows.values():
-            if not window.is_collapsed:
-                window.collapse()
-                
-    def expand_all_windows(self):
-        for window in self.windows.values():
-            if window.is_collapsed:
-                window.expand()
-            
-    def on_tray_activated(self, reason):
-        if reason == QSystemTrayIcon.DoubleClick:
-            any_visible = any(window.isVisible() for window in self.windows.values())
-            if any_visible:
-                self.hide_all_windows()
-            else:
-                self.show_all_windows()
-                
-    def show_settings(self):
-        dialog = SettingsDialog(self.data_manager.api_client, None)
-        if dialog.exec() == QDialog.Accepted:
-            self.load_settings()
-            self.data_manager.manual_refresh()
-            
-            if self.data_manager.socketio_thread:
-                self.data_manager.socketio_thread.stop()
-                self.data_manager.start_socketio()
-                
     def quit_application(self):
-        self.data_manager.stop()
+        # 退出时连同共用同一 BoardHub 的所有白板一起停止
+        self.hub.shutdown()
         QApplication.quit()
-    def __init__(self):
-        self.data_manager = DataManager()
+
+class WindowManager:
+    def __init__(self, board=None, hub=None, index=0):
+        # 多白板时每个白板一个 WindowManager，index 决定窗口排在第几行
+        self.board = board
+        self.index = index
+        self.data_manager = DataManager(board, hub)
         self.windows = {}
-        self.tray_icon = None
+        self.services_started = False
         
+        # 分阶段启动：先托盘和窗口（带本地缓存的数据），首帧画出来之后再联网
+        # 托盘菜单要列出各个窗口，所以先建窗口
         self.setup_windows()
         self.setup_tray()
         self.connect_signals()
-        self.load_settings()
+        self.apply_window_settings()
+        self.show_cached_data()
+        STARTUP.mark("windows")
+        
+        self.first_paint_filter = FirstPaintFilter(self.on_first_paint)
+        for window in self.windows.values():
+            window.installEventFilter(self.first_paint_filter)
+        # 窗口一直没显示（例如全部隐藏）也要按时启动服务
+        QTimer.singleShot(1000, self.start_services)
+        
+    def on_first_paint(self):
+        STARTUP.mark("first_paint")
+        for window in self.windows.values():
+            window.removeEventFilter(self.first_paint_filter)
+        self.start_services()
+        
+    def show_cached_data(self):
+        board_id, secret_key = self.data_manager.board_credentials()
+        if board_id and secret_key:
+            self.data_manager.setup(SERVER, board_id, secret_key)
+            self.data_manager.load_snapshot()
+            
+    def start_services(self):
+        if self.services_started:
+            return
+        self.services_started = True
+        self.start_data_services()
         
     def setup_windows(self):
         self.windows['task'] = TaskFloatingWindow()
@@ -2162,14 +4206,25 @@ class WindowManager:
         
         for window in self.windows.values():
             window.set_data_manager(self.data_manager)
+            if self.board:
+                window.title_label.setText(f"{self.board_name()} · {window.title}")
+                
+    def board_name(self):
+        if self.board:
+            return self.board.get('name') or self.board.get('board_id', '')
+        return ""
             
     def setup_tray(self):
-        self.tray_icon = QSystemTrayIcon()
-        self.tray_icon.setIcon(self.create_tray_icon())
-        
-        tray_menu = QMenu()
+        # 同一 BoardHub 下的白板共用一个托盘图标和通知队列
+        hub = self.data_manager.hub
+        if hub.tray is None:
+            hub.tray = BoardTray(hub)
+        self.tray = hub.tray
+        self.notifications = self.tray.notifications
+        self.tray.add_board(self)
         
-        window_menu = QMenu("窗口控制", tray_menu)
+    def create_window_menu(self, parent):
+        window_menu = QMenu("窗口控制", parent)
         
         show_all_action = QAction("显示所有窗口", window_menu)
         show_all_action.triggered.connect(self.show_all_windows)
@@ -2194,118 +4249,53 @@ class WindowManager:
             action = QAction(f"显示{window.title}窗口", window_menu)
             action.triggered.connect(lambda checked, w=window: w.show())
             window_menu.addAction(action)
-            
-        tray_menu.addMenu(window_menu)
-        
-        settings_action = QAction("设置", tray_menu)
-        settings_action.triggered.connect(self.show_settings)
-        tray_menu.addAction(settings_action)
-        
-        refresh_action = QAction("刷新数据", tray_menu)
-        refresh_action.triggered.connect(self.data_manager.manual_refresh)
-        tray_menu.addAction(refresh_action)
-        
-        tray_menu.addSeparator()
-        
-        quit_action = QAction("退出", tray_menu)
-        quit_action.triggered.connect(self.quit_application)
-        tray_menu.addAction(quit_action)
-        
-        self.tray_icon.setContextMenu(tray_menu)
-        self.tray_icon.activated.connect(self.on_tray_activated)
-        self.tray_icon.show()
-        
-    def create_tray_icon(self):
-        pixmap = QPixmap(64, 64)
-        pixmap.fill(Qt.transparent)
-        
-        painter = QPainter(pixmap)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        gradient = QLinearGradient(0, 0, 64, 64)
-        gradient.setColorAt(0, QColor(102, 126, 234))
-        gradient.setColorAt(1, QColor(118, 75, 162))
-        
-        painter.setBrush(QBrush(gradient))
-        painter.setPen(Qt.NoPen)
-        painter.drawEllipse(4, 4, 56, 56)
-        
-        painter.setPen(QPen(Qt.white))
-        painter.setFont(QFont("Arial", 24, QFont.Bold))
-        painter.drawText(pixmap.rect(), Qt.AlignCenter, "W")
-        
-        painter.end()
-        return QIcon(pixmap)
+        return window_menu
         
     def connect_signals(self):
-        self.data_manager.data_updated.connect(self.on_data_updated)
+        self.data_manager.partition_updated.connect(self.on_partition_updated)
         self.data_manager.error_occurred.connect(self.show_error)
         self.data_manager.system_notification.connect(self.show_system_notification)
         self.data_manager.socketio_status.connect(self.on_socketio_status)
-        print("所有信号已连接")
-        
-    def show_system_notification(self, title, content, level):
-        print(f"触发系统通知: {title} - {content}, 级别: {level}")
-        
-        settings = QSettings("WhiteboardClient", "Config")
-        
-        # 检查是否启用了系统级通知
-        system_level_enabled = settings.value("system_level_notify", True, type=bool)
-        
-        # 根据级别决定是否显示通知
-        if level == 3 and not system_level_enabled:
-            print("系统级通知已禁用")
-            return
-            
-        # 检查基本通知设置
-        notify_enabled = settings.value("notify_new", True, type=bool)
-        
-        print(f"通知设置状态: {notify_enabled}")
-        
-        if notify_enabled:
-            # 根据级别设置不同的图标和持续时间
-            if level == 3:  # 系统级警告
-                icon = QSystemTrayIcon.Critical
-                duration = 10000  # 10秒
-            elif level == 2:  # 警告
-                icon = QSystemTrayIcon.Warning
-                duration = 7000  # 7秒
-            else:  # 普通信息
-                icon = QSystemTrayIcon.Information
-                duration = 5000  # 5秒
-                
-            self.tray_icon.showMessage(
-                title, 
-                content, 
-                icon, 
-                duration
-            )
-            print(f"系统通知已发送，级别: {level}")
+        ui_log.debug("所有信号已连接")
+        
+    @METRICS.timed("notify show")
+    def show_system_notification(self, title, content, level, key=""):
+        # 只入队，显示、限速和弹窗都由通知队列在事件循环里完成
+        ui_log.debug("触发系统通知: %s - %s, 级别: %s", title, content, level)
+        # 多个白板共用一个托盘，其他白板的通知标题前加上白板名
+        if self.board:
+            title = f"{self.board_name()} · {title}"
+            key = f"{self.board['board_id']}:{key}" if key else key
+        self.notifications.post(title, content, level, key)
             
     def on_socketio_status(self, connected, message):
         status = "已连接" if connected else "未连接"
-        print(f"Socket.IO状态: {status} - {message}")
+        ui_log.info("Socket.IO状态: %s - %s", status, message)
         
+        name = f"白板客户端 {self.board_name()}".rstrip()
         if connected:
-            self.tray_icon.setToolTip(f"白板客户端 - Socket.IO已连接")
+            self.tray.set_status(self, f"{name} - Socket.IO已连接")
         else:
-            self.tray_icon.setToolTip(f"白板客户端 - Socket.IO未连接: {message}")
+            self.tray.set_status(self, f"{name} - Socket.IO未连接: {message}")
             
-    def on_data_updated(self, data):
-        for window in self.windows.values():
-            window.update_data(data)
+    def on_partition_updated(self, name, items, changed):
+        # 每个窗口只收到自己分区的条目和其中变化的id
+        window = self.windows.get(name)
+        if window:
+            window.update_partition(items, changed)
             
     def show_error(self, error_msg):
-        self.tray_icon.showMessage("错误", error_msg, QSystemTrayIcon.Critical, 3000)
+        title = f"{self.board_name()} · 错误" if self.board else "错误"
+        self.tray.icon.showMessage(title, error_msg, QSystemTrayIcon.Critical, 3000)
         
-    def load_settings(self):
+    def apply_window_settings(self):
         settings = QSettings("WhiteboardClient", "Config")
-        board_id = settings.value("board_id", "")
-        secret_key = settings.value("secret_key", "")
         window_level = settings.value("window_level", 0, type=int)
         opacity = settings.value("opacity", 90, type=int)
+        render_mode = settings.value("render_mode", "widgets")
         
         for window in self.windows.values():
+            window.set_render_mode(render_mode)
             if window_level == 1:
                 window.setWindowFlags(window.windowFlags() | Qt.WindowStaysOnTopHint)
             elif window_level == 2:
@@ -2313,25 +4303,36 @@ class WindowManager:
                 
             window.setWindowOpacity(opacity / 100.0)
             
+        self.arrange_windows()
+        
+    def load_settings(self):
+        self.apply_window_settings()
+        self.start_data_services()
+        
+    def start_data_services(self):
+        board_id, secret_key = self.data_manager.board_credentials()
         if board_id and secret_key:
             self.data_manager.setup(SERVER, board_id, secret_key)
+            self.data_manager.load_snapshot()
             self.data_manager.start_data_fetching()
             self.data_manager.start_heartbeat()
             self.data_manager.start_socketio()
-            print("所有服务已启动")
-            
-        self.arrange_windows()
+            ui_log.info("所有服务已启动")
         
     def arrange_windows(self):
-        screen_geometry = QGuiApplication.primaryScreen().geometry()
+        # 按可用区域（去掉任务栏）排列；白板多到放不下时回到第一行并错开一点，始终留在屏幕内
+        available = QGuiApplication.primaryScreen().availableGeometry()
         
         window_width = 300
         window_height = 400
         spacing = 10
+        cascade = 30
         total_width = (window_width * 3) + (spacing * 2)
         
-        start_x = (screen_geometry.width() - total_width) // 2
-        y_pos = 50
+        rows = max(1, (available.height() - 50) // (window_height + spacing))
+        row, layer = self.index % rows, self.index // rows
+        start_x = available.x() + (available.width() - total_width) // 2 + layer * cascade
+        y_pos = available.y() + 50 + row * (window_height + spacing) + layer * cascade
         
         positions = {
             'task': (start_x, y_pos),
@@ -2339,9 +4340,11 @@ class WindowManager:
             'announcement': (start_x + (window_width + spacing) * 2, y_pos)
         }
         
+        max_x = available.x() + max(0, available.width() - window_width)
+        max_y = available.y() + max(0, available.height() - window_height)
         for name, window in self.windows.items():
-            pos = positions.get(name, (0, 0))
-            window.move(pos[0], pos[1])
+            x, y = positions.get(name, (0, 0))
+            window.move(min(max(x, available.x()), max_x), min(max(y, available.y()), max_y))
             
     def show_all_windows(self):
         for window in self.windows.values():
@@ -2362,38 +4365,51 @@ class WindowManager:
             if window.is_collapsed:
                 window.expand()
             
-    def on_tray_activated(self, reason):
-        if reason == QSystemTrayIcon.DoubleClick:
-            any_visible = any(window.isVisible() for window in self.windows.values())
-            if any_visible:
-                self.hide_all_windows()
-            else:
-                self.show_all_windows()
-                
     def show_settings(self):
         dialog = SettingsDialog(self.data_manager.api_client, None)
         if dialog.exec() == QDialog.Accepted:
             self.load_settings()
+            self.notifications.reload_settings()
+            # 样式缓存已失效，用现有数据重新套用样式，不必等数据变化
+            for window in self.windows.values():
+                window.update_partition(window.last_data)
             self.data_manager.manual_refresh()
-            
-            if self.data_manager.socketio_thread:
-                self.data_manager.socketio_thread.stop()
-                self.data_manager.start_socketio()
-                
-    def quit_application(self):
-        self.data_manager.stop()
-        QApplication.quit()
+
+def load_extra_boards():
+    # 除主白板外要在同一进程里显示的白板，保存在设置的 boards 数组里
+    settings = QSettings("WhiteboardClient", "Config")
+    boards = []
+    count = settings.beginReadArray("boards")
+    for i in range(count):
+        settings.setArrayIndex(i)
+        board = {
+            'board_id': settings.value("board_id", ""),
+            'secret_key': settings.value("secret_key", ""),
+            'name': settings.value("name", "")
+        }
+        if board['board_id'] and board['secret_key']:
+            boards.append(board)
+    settings.endArray()
+    return boards
 
 def main():
+    STARTUP.mark("import")
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
     
     app.setStyle("Fusion")
+    log_listener = setup_logging()
     
-    window_manager = WindowManager()
-    window_manager.show_all_windows()
+    hub = BoardHub()
+    window_managers = [WindowManager(hub=hub)]
+    for index, board in enumerate(load_extra_boards(), start=1):
+        window_managers.append(WindowManager(board, hub, index))
+    for window_manager in window_managers:
+        window_manager.show_all_windows()
     
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    log_listener.stop()
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,323 @@
+"""
+客户端整体基准：对着本地模拟服务器跑完整的 WindowManager
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_client.py --items 100 --output result.json
+
+测量项：
+    startup        启动到窗口显示首批数据、Socket.IO 连上的耗时
+    refresh        manual_refresh 到三个窗口刷新完成的延迟
+    event_to_pixel 服务器推送 new_task 到任务窗口完成重绘的延迟（含事件合并的安静窗口）
+    widget_build   10/100/1000 条数据在两种渲染模式下的构建+首次绘制耗时
+    idle           空闲期间的 CPU 时间、线程上下文切换（唤醒）次数和调度线程唤醒次数
+    rss_kb         各阶段的常驻内存
+    connections    新建的 HTTP 连接数和复用次数（connection_stats）
+    metrics        客户端自身记录的热点路径统计（METRICS）
+配置和本地缓存写到临时目录，不会碰到真实的设置。结果以 JSON 输出。
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+# 必须在 Qt 读取配置路径之前设置
+PROFILE_DIR = tempfile.mkdtemp(prefix="dlass-bench-")
+os.environ["XDG_CONFIG_HOME"] = os.path.join(PROFILE_DIR, "config")
+os.environ["XDG_DATA_HOME"] = os.path.join(PROFILE_DIR, "data")
+
+from PySide6.QtCore import QEvent, QEventLoop, QObject, QSettings, QTimer
+from PySide6.QtWidgets import QApplication, QWidget
+
+import app
+from fake_server import FakeDlassServer, make_item
+
+
+class PaintProbe(QObject):
+    # 记录目标窗口在 arm() 之后的第一次绘制
+    def __init__(self, window):
+        super().__init__()
+        self.window = window
+        self.armed = False
+        self.painted_at = None
+
+    def arm(self):
+        self.armed = True
+        self.painted_at = None
+
+    def eventFilter(self, obj, event):
+        if (self.armed and event.type() == QEvent.Paint and isinstance(obj, QWidget)
+                and obj.window() is self.window):
+            self.painted_at = time.perf_counter()
+            self.armed = False
+        return False
+
+
+def wait_until(qt_app, predicate, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            return False
+        qt_app.processEvents()
+        time.sleep(0.0005)
+    return True
+
+
+def idle(qt_app, seconds):
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+class LayoutProbe(QObject):
+    # 统计窗口排版相关的事件，用来判断启动后的排版是否已经结束
+    TYPES = (QEvent.Move, QEvent.Resize, QEvent.LayoutRequest, QEvent.Paint)
+
+    def __init__(self):
+        super().__init__()
+        self.events = 0
+
+    def eventFilter(self, obj, event):
+        if event.type() in self.TYPES:
+            self.events += 1
+        return False
+
+
+def settle(qt_app, seconds=2.0, quiet=0.5, timeout=15.0):
+    # 空闲测量之前先等启动后的排版结束：先空转一段时间，再处理事件直到连续 quiet 秒没有排版事件
+    idle(qt_app, seconds)
+    probe = LayoutProbe()
+    qt_app.installEventFilter(probe)
+    try:
+        deadline = time.perf_counter() + timeout
+        quiet_since, seen = time.perf_counter(), probe.events
+        while time.perf_counter() < deadline:
+            qt_app.processEvents()
+            time.sleep(0.01)
+            if probe.events != seen:
+                quiet_since, seen = time.perf_counter(), probe.events
+            elif time.perf_counter() - quiet_since >= quiet:
+                return True
+        return False
+    finally:
+        qt_app.removeEventFilter(probe)
+
+
+def rss_kb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def context_switches():
+    # 所有线程的自愿+非自愿上下文切换次数之和，近似进程的唤醒次数；非 Linux 返回 None
+    total = 0
+    paths = glob.glob("/proc/self/task/*/status")
+    if not paths:
+        return None
+    for path in paths:
+        try:
+            with open(path) as f:
+                for line in f:
+                    if line.startswith(("voluntary_ctxt_switches", "nonvoluntary_ctxt_switches")):
+                        total += int(line.split()[1])
+        except OSError:
+            # 线程在读取过程中退出
+            continue
+    return total
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    if not samples:
+        return None
+    return {
+        "n": len(samples),
+        "min_ms": round(samples[0] * 1000, 2),
+        "p50_ms": round(statistics.median(samples) * 1000, 2),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 2),
+        "max_ms": round(samples[-1] * 1000, 2)
+    }
+
+
+def bench_refresh(qt_app, server, manager, repeat):
+    updates = []
+    manager.data_manager.data_updated.connect(lambda data: updates.append(time.perf_counter()))
+    samples = []
+    for _ in range(repeat):
+        # 改版本号，保证每次都走完整的 200 响应和重建
+        server.touch()
+        count = len(updates)
+        start = time.perf_counter()
+        manager.data_manager.manual_refresh()
+        if wait_until(qt_app, lambda: len(updates) > count):
+            samples.append(updates[-1] - start)
+        idle(qt_app, 0.05)
+    return summarize(samples)
+
+
+def bench_event_to_pixel(qt_app, server, manager, repeat):
+    window = manager.windows['task']
+    probe = PaintProbe(window)
+    qt_app.installEventFilter(probe)
+
+    store_samples = []
+    pixel_samples = []
+    try:
+        for _ in range(repeat):
+            stored = []
+            probe.armed = False
+            probe.painted_at = None
+
+            def on_update(data, stored=stored):
+                if not stored and any(item.id == pushed['id'] for item in data):
+                    stored.append(time.perf_counter())
+                    probe.arm()
+
+            manager.data_manager.data_updated.connect(on_update)
+            start = time.perf_counter()
+            pushed = server.push('new_task', 'task')
+            ok = wait_until(qt_app, lambda: probe.painted_at is not None)
+            manager.data_manager.data_updated.disconnect(on_update)
+            if ok:
+                store_samples.append(stored[0] - start)
+                pixel_samples.append(probe.painted_at - start)
+            idle(qt_app, 0.2)
+    finally:
+        qt_app.removeEventFilter(probe)
+
+    return {"event_to_store": summarize(store_samples), "event_to_pixel": summarize(pixel_samples)}
+
+
+def bench_widget_build(qt_app, sizes, repeat):
+    results = []
+    for mode in ("widgets", "virtual"):
+        for size in sizes:
+            # 和 DataManager 一样先用 BoardIndex 分区，只测窗口自己的构建和绘制
+            index = app.BoardIndex()
+            index.update([app.make_item(item) for item in (make_item('task', i) for i in range(size))], time.time())
+            items = index.items('task')
+            runs = []
+            for _ in range(repeat):
+                window = app.TaskFloatingWindow()
+                window.set_render_mode(mode)
+                window.show()
+                qt_app.processEvents()
+
+                start = time.perf_counter()
+                window.update_partition(items)
+                built = time.perf_counter()
+                qt_app.processEvents()
+                painted = time.perf_counter()
+                runs.append((built - start, painted - start))
+
+                window.close()
+                window.deleteLater()
+                qt_app.processEvents()
+            build, total = min(runs, key=lambda r: r[1])
+            results.append({
+                "mode": mode,
+                "items": size,
+                "build_ms": round(build * 1000, 2),
+                "build_and_paint_ms": round(total * 1000, 2)
+            })
+    return results
+
+
+def bench_idle(qt_app, manager, seconds):
+    settled = settle(qt_app)
+    scheduler = manager.data_manager.scheduler
+    wakeups = scheduler.wakeups
+    switches = context_switches()
+    cpu = time.process_time()
+    idle(qt_app, seconds)
+    cpu = time.process_time() - cpu
+    switches_after = context_switches()
+    return {
+        "seconds": seconds,
+        "settled": settled,
+        "cpu_ms": round(cpu * 1000, 2),
+        "cpu_percent": round(cpu / seconds * 100, 3),
+        "context_switches_per_s": None if switches is None else round((switches_after - switches) / seconds, 2),
+        "scheduler_wakeups": scheduler.wakeups - wakeups
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100, help="服务器上的条目数")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--sizes", default="10,100,1000", help="widget_build 的条目数，逗号分隔")
+    parser.add_argument("--idle", type=float, default=10.0, help="空闲测量时长（秒）")
+    parser.add_argument("--output", help="结果另存为 JSON 文件")
+    args = parser.parse_args()
+
+    qt_app = QApplication.instance() or QApplication(sys.argv)
+    qt_app.setQuitOnLastWindowClosed(False)
+
+    server = FakeDlassServer().start()
+    server.populate(args.items)
+
+    settings = QSettings("WhiteboardClient", "Config")
+    settings.setValue("board_id", "bench")
+    settings.setValue("secret_key", "bench")
+    settings.sync()
+    app.SERVER = server.url
+    # 模拟服务器只支持长轮询
+    app.SocketIOClientThread.transports = ['polling']
+
+    result = {"benchmark": "client", "items": args.items, "rss_kb": {"baseline": rss_kb()}}
+    # 客户端自身的日志输出不混进结果
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        manager = app.WindowManager()
+        manager.show_all_windows()
+        first_data = wait_until(qt_app, lambda: bool(manager.windows['task'].last_data))
+        data_ms = (time.perf_counter() - start) * 1000
+        # 连接线程由 BoardHub 在下一轮事件循环里创建
+        connected = wait_until(qt_app, lambda: bool(manager.data_manager.socketio_thread)
+                               and manager.data_manager.socketio_thread.is_connected())
+        result["startup"] = {
+            "first_data_ms": round(data_ms, 2) if first_data else None,
+            "socket_connected_ms": round((time.perf_counter() - start) * 1000, 2) if connected else None
+        }
+        result["rss_kb"]["started"] = rss_kb()
+
+        result["refresh"] = bench_refresh(qt_app, server, manager, args.repeat)
+        result["event_to_pixel"] = bench_event_to_pixel(qt_app, server, manager, args.repeat)
+        result["idle"] = bench_idle(qt_app, manager, args.idle)
+        result["widget_build"] = bench_widget_build(
+            qt_app, [int(size) for size in args.sizes.split(",")], max(1, args.repeat // 3))
+        result["rss_kb"]["after_build"] = rss_kb()
+
+        result["server_counters"] = dict(server.counters)
+        result["connections"] = manager.data_manager.api_client.connection_stats()
+        result["metrics"] = app.METRICS.snapshot()
+        manager.data_manager.stop()
+        server.stop()
+    shutil.rmtree(PROFILE_DIR, ignore_errors=True)
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
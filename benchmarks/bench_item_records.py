@@ -0,0 +1,111 @@
+"""
+条目记录的内存和开销基准：JSON 字典 vs 入库时构建的条目记录
+
+    python benchmarks/bench_item_records.py --items 1000,10000,50000
+
+按模拟服务器的条目格式生成 /api/whiteboard/all 的响应体，分别测量：
+解析出的字典本身占用的内存、转成条目记录后（字典释放）占用的内存、构建记录的耗时，
+以及按窗口分区和生成剩余时间文字时字典和记录各自的耗时。结果以 JSON 输出。
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import app
+from fake_server import make_item
+
+
+def make_payload(count):
+    kinds = ("task", "assignment", "announcement")
+    items = [make_item(kinds[i % 3], i) for i in range(count)]
+    return json.dumps({"success": True, "data": items}, ensure_ascii=False).encode("utf-8")
+
+
+def measure(build):
+    # 返回 (构建结果, 仍然占用的内存字节数, 耗时秒)
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def legacy_partition(items, now):
+    # 改动前每个窗口对字典做的筛选和时间解析
+    visible = 0
+    for item in items:
+        item_type = item.get('type')
+        if item_type == 'task' and not item.get('is_completed', False):
+            visible += 1
+        elif item_type == 'assignment':
+            visible += 1
+        elif item_type == 'announcement':
+            due_date = item.get('due_date', '')
+            if item.get('is_long_term', False) or not due_date:
+                visible += 1
+            else:
+                try:
+                    if time.mktime(time.strptime(due_date, "%Y-%m-%d %H:%M:%S")) >= now:
+                        visible += 1
+                except ValueError:
+                    visible += 1
+    return visible
+
+
+def run(count):
+    payload = make_payload(count)
+
+    dicts, dict_bytes, decode_s = measure(lambda: json.loads(payload)["data"])
+    records, record_bytes, build_s = measure(lambda: [app.make_item(item) for item in json.loads(payload)["data"]])
+
+    now = time.time()
+    start = time.perf_counter()
+    legacy_partition(dicts, now)
+    dict_partition_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    app.BoardIndex().update(records, now)
+    record_partition_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for item in records:
+        app.DataItemWidget.time_bucket(item, now)
+    time_text_s = time.perf_counter() - start
+
+    return {
+        "items": count,
+        "payload_kb": round(len(payload) / 1024, 1),
+        "dict_kb": round(dict_bytes / 1024, 1),
+        "record_kb": round(record_bytes / 1024, 1),
+        "saved_percent": round((1 - record_bytes / dict_bytes) * 100, 1) if dict_bytes else None,
+        "bytes_per_item": {"dict": round(dict_bytes / count, 1), "record": round(record_bytes / count, 1)},
+        "decode_ms": round(decode_s * 1000, 2),
+        "decode_and_build_ms": round(build_s * 1000, 2),
+        "partition_ms": {"dict": round(dict_partition_s * 1000, 2), "record": round(record_partition_s * 1000, 2)},
+        "time_text_ms": round(time_text_s * 1000, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", default="1000,10000,50000", help="条目数，逗号分隔")
+    args = parser.parse_args()
+
+    results = [run(int(count)) for count in args.items.split(",")]
+    print(json.dumps({"benchmark": "item_records", "results": results}, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+/api/whiteboard/all 响应解码基准：各 JSON 后端和增量解析的对比
+
+    python benchmarks/bench_json_decode.py --items 1000,10000,50000
+
+按模拟服务器的条目格式生成响应体，对每个可用后端（orjson / msgspec / 标准库 json）
+测量解码并转成条目记录的耗时；stream 为边下载边解析的增量解析器，按 64KB 分块喂入，
+额外给出解析出第一批条目的耗时，即界面最早能开始显示的时间。结果以 JSON 输出。
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import app
+from fake_server import make_item
+
+
+def make_payload(count):
+    kinds = ("task", "assignment", "announcement")
+    items = [make_item(kinds[i % 3], i) for i in range(count)]
+    return json.dumps({"success": True, "board_version": count, "data": items},
+                      ensure_ascii=False).encode("utf-8")
+
+
+def best_of(repeat, fn):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def stream(body, chunk_size, first_batch):
+    # 返回 (总耗时, 拿到第一批条目的耗时)
+    start = time.perf_counter()
+    first = None
+    parser = app.ItemStreamParser()
+    for offset in range(0, len(body), chunk_size):
+        parser.feed(body[offset:offset + chunk_size])
+        if first is None and len(parser.items) >= first_batch:
+            first = time.perf_counter() - start
+    parser.close()
+    total = time.perf_counter() - start
+    return total, first if first is not None else total
+
+
+def run(count, repeat, chunk_size, first_batch):
+    body = make_payload(count)
+    result = {"items": count, "payload_kb": round(len(body) / 1024, 1), "decode_ms": {}}
+
+    for name, loads in app.load_json_backends().items():
+        elapsed = best_of(repeat, lambda: app.decode_board_payload(body, loads))
+        result["decode_ms"][name] = round(elapsed * 1000, 2)
+
+    runs = [stream(body, chunk_size, first_batch) for _ in range(repeat)]
+    total, first = min(runs)
+    result["decode_ms"]["stream"] = round(total * 1000, 2)
+    result["stream_first_items_ms"] = round(first * 1000, 2)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", default="1000,10000,50000", help="条目数，逗号分隔")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--chunk", type=int, default=64 * 1024, help="增量解析每次喂入的字节数")
+    parser.add_argument("--first-batch", type=int, default=200, help="第一批条目数")
+    args = parser.parse_args()
+
+    results = [run(int(count), args.repeat, args.chunk, args.first_batch) for count in args.items.split(",")]
+    print(json.dumps({"benchmark": "json_decode", "backends": list(app.load_json_backends()),
+                      "results": results}, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
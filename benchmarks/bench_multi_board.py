@@ -0,0 +1,151 @@
+"""
+单进程多白板的开销基准：每个白板多占多少内存、线程和空闲 CPU
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_multi_board.py --boards 1,2,4,8
+
+每个白板数在独立的子进程里启动（BoardHub + N 个 WindowManager），等所有白板拿到数据、
+加入共享的 Socket.IO 连接、
+窗口排版结束（settled）后空闲一段时间再测量。per_board 是相对 1 个白板时每多一个白板的增量；
+separate_processes_rss_kb 是同样数量的白板各开一个进程时的估算值（N × 单白板进程）。
+模拟服务器跑在父进程里，不计入子进程的开销。结果以 JSON 输出。
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+
+def run_child(boards, server_url, idle_seconds):
+    # 配置写到临时目录，必须在 Qt 读取配置路径之前设置
+    profile_dir = tempfile.mkdtemp(prefix="dlass-multi-")
+    os.environ["XDG_CONFIG_HOME"] = os.path.join(profile_dir, "config")
+    os.environ["XDG_DATA_HOME"] = os.path.join(profile_dir, "data")
+
+    from PySide6.QtCore import QSettings
+    from PySide6.QtWidgets import QApplication
+
+    import app
+    from bench_client import context_switches, idle, rss_kb, settle, wait_until
+
+    qt_app = QApplication.instance() or QApplication(sys.argv)
+    qt_app.setQuitOnLastWindowClosed(False)
+
+    settings = QSettings("WhiteboardClient", "Config")
+    settings.setValue("board_id", "board-0")
+    settings.setValue("secret_key", "bench")
+    settings.beginWriteArray("boards")
+    for i in range(1, boards):
+        settings.setArrayIndex(i - 1)
+        settings.setValue("board_id", f"board-{i}")
+        settings.setValue("secret_key", "bench")
+        settings.setValue("name", f"班级{i}")
+    settings.endArray()
+    settings.sync()
+    app.SERVER = server_url
+    # 模拟服务器只支持长轮询
+    app.SocketIOClientThread.transports = ['polling']
+
+    baseline = rss_kb()
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        hub = app.BoardHub()
+        managers = [app.WindowManager(hub=hub)]
+        for index, board in enumerate(app.load_extra_boards(), start=1):
+            managers.append(app.WindowManager(board, hub, index))
+        for manager in managers:
+            manager.show_all_windows()
+
+        ready = wait_until(qt_app, lambda: all(manager.windows['task'].last_data for manager in managers)
+                           and hub.socketio_thread is not None
+                           and len(hub.socketio_thread.joined_boards) == boards, timeout=30)
+        ready_ms = (time.perf_counter() - start) * 1000
+        # 刚就绪时窗口还在排版，等排版结束再测空闲开销
+        settled = settle(qt_app)
+
+        switches = context_switches()
+        cpu = time.process_time()
+        idle(qt_app, idle_seconds)
+        cpu = time.process_time() - cpu
+        switches_after = context_switches()
+
+        result = {
+            "boards": boards,
+            "ready": ready,
+            "ready_ms": round(ready_ms, 2),
+            "settled": settled,
+            "rss_kb": rss_kb(),
+            "rss_delta_kb": rss_kb() - baseline,
+            "threads": len(os.listdir("/proc/self/task")) if os.path.isdir("/proc/self/task") else None,
+            "idle_cpu_percent": round(cpu / idle_seconds * 100, 3),
+            "idle_context_switches_per_s": None if switches is None
+            else round((switches_after - switches) / idle_seconds, 2)
+        }
+        hub.shutdown()
+    shutil.rmtree(profile_dir, ignore_errors=True)
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--boards", default="1,2,4,8", help="要测量的白板数，逗号分隔")
+    parser.add_argument("--items", type=int, default=60, help="每个白板的条目数")
+    parser.add_argument("--idle", type=float, default=5.0, help="空闲测量时长（秒）")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--server", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help="结果另存为 JSON 文件")
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.server, args.idle)
+        return
+
+    from fake_server import FakeDlassServer
+
+    server = FakeDlassServer().start()
+    server.populate(args.items)
+
+    runs = []
+    for boards in [int(count) for count in args.boards.split(",")]:
+        connects = server.counters["connects"]
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", str(boards),
+             "--server", server.url, "--idle", str(args.idle)],
+            capture_output=True, text=True, check=True).stdout
+        run = json.loads(output.strip().splitlines()[-1])
+        run["socketio_connections"] = server.counters["connects"] - connects
+        runs.append(run)
+    server.stop()
+
+    result = {"benchmark": "multi_board", "items": args.items, "runs": runs}
+    single = next((run for run in runs if run["boards"] == 1), None)
+    if single:
+        for run in runs:
+            run["separate_processes_rss_kb"] = single["rss_kb"] * run["boards"]
+            if run["boards"] > 1:
+                extra = run["boards"] - 1
+                run["per_board"] = {
+                    "rss_kb": round((run["rss_kb"] - single["rss_kb"]) / extra, 1),
+                    "threads": round((run["threads"] - single["threads"]) / extra, 2)
+                    if run["threads"] is not None else None,
+                    "idle_cpu_percent": round((run["idle_cpu_percent"] - single["idle_cpu_percent"]) / extra, 3)
+                }
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
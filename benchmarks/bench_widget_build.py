@@ -0,0 +1,130 @@
+"""
+条目控件构建耗时基准：共享样式表 vs 逐个 setStyleSheet
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_widget_build.py --items 500
+
+legacy 模式在每个条目和按钮上重新设置旧版的样式表，用来还原改动前的开销；
+结果以 JSON 输出到标准输出。
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication, QPushButton
+
+import app
+
+LEGACY_ITEM_QSS = app.ITEM_STYLESHEET.split("QPushButton#ackButton, QPushButton#completeButton")[0]
+LEGACY_ACK_QSS = """
+    QPushButton {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #3498db, stop:1 #2980b9);
+        color: white; border: none; border-radius: 4px; font-weight: bold;
+        padding: 4px 8px; font-size: 9px;
+    }
+    QPushButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #3cb0fd, stop:1 #3498db);
+    }
+"""
+LEGACY_COMPLETE_QSS = """
+    QPushButton {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #2ecc71, stop:1 #27ae60);
+        color: white; border: none; border-radius: 4px; font-weight: bold;
+        padding: 4px 8px; font-size: 9px;
+    }
+    QPushButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #58d68d, stop:1 #2ecc71);
+    }
+"""
+
+
+class LegacyDataItemWidget(app.DataItemWidget):
+    # 还原改动前的做法：每个条目、标签、按钮各自设置样式表
+    def setup_ui(self):
+        super().setup_ui()
+        self.setStyleSheet(LEGACY_ITEM_QSS)
+        self.title_label.setStyleSheet(f"color: {self.style_config['title_color']};")
+        self.details_label.setStyleSheet(f"color: {self.style_config['content_color']}; margin-top: 3px;")
+        self.time_label.setStyleSheet(f"color: {self.style_config['time_color']}; margin-top: 6px;")
+        if self.action_bar is not None:
+            ack_btn, complete_btn = self.action_bar.findChildren(QPushButton)
+            ack_btn.setStyleSheet(LEGACY_ACK_QSS)
+            complete_btn.setStyleSheet(LEGACY_COMPLETE_QSS)
+
+
+def make_items(count):
+    return [
+        {
+            'id': i,
+            'type': 'task',
+            'title': f'任务 {i}',
+            'description': '请按时完成',
+            'priority': 1 + i % 3,
+            'due_date': '2030-01-01 08:00:00'
+        }
+        for i in range(count)
+    ]
+
+
+def run(qt_app, items, legacy):
+    original = app.DataItemWidget
+    if legacy:
+        app.DataItemWidget = LegacyDataItemWidget
+    try:
+        window = app.TaskFloatingWindow()
+        window.show()
+        qt_app.processEvents()
+
+        # 和 DataManager 一样先用 BoardIndex 分区，只测窗口自己的构建
+        index = app.BoardIndex()
+        index.update([app.make_item(item) for item in items], time.time())
+        partition = index.items(window.partition)
+
+        start = time.perf_counter()
+        window.update_partition(partition)
+        built = time.perf_counter()
+        # 样式在首次显示时才真正解析和应用，这部分也要算进去
+        qt_app.processEvents()
+        polished = time.perf_counter()
+
+        window.close()
+        window.deleteLater()
+        qt_app.processEvents()
+    finally:
+        app.DataItemWidget = original
+
+    return {
+        "mode": "legacy" if legacy else "shared",
+        "items": len(items),
+        "build_ms": round((built - start) * 1000, 2),
+        "build_and_polish_ms": round((polished - start) * 1000, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    qt_app = QApplication.instance() or QApplication(sys.argv)
+    items = make_items(args.items)
+
+    results = []
+    for legacy in (True, False):
+        # 客户端自身的日志输出不混进结果
+        with contextlib.redirect_stdout(io.StringIO()):
+            runs = [run(qt_app, items, legacy) for _ in range(args.repeat)]
+        best = min(runs, key=lambda r: r["build_and_polish_ms"])
+        results.append(best)
+
+    print(json.dumps({"benchmark": "widget_build", "results": results}, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
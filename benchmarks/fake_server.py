@@ -0,0 +1,256 @@
+"""
+本地模拟的 Dlass 服务器：HTTP 接口 + Socket.IO 推送，供基准测试使用
+
+    python benchmarks/fake_server.py --port 5000 --items 100
+
+实现客户端用到的全部接口：
+    GET  /api/whiteboard/all | tasks | assignments | announcements
+    POST /api/whiteboard/tasks/<id>/acknowledge | complete
+    POST /api/whiteboard/tasks/batch（batch_supported 为 False 时返回 404，模拟旧服务器）
+    POST /api/whiteboard/heartbeat
+Socket.IO 支持 heartbeat、join_board（同一连接加入更多白板）和 resume（按 last_event_id 补发漏掉的事件），
+通过 push() 发出 new_task / update_assignment / delete_* 等推送事件。
+
+只用 wsgiref 多线程服务器，没有 WebSocket，客户端需要使用 polling 传输。
+"""
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+import socketio
+
+LIST_PATHS = {
+    "/api/whiteboard/tasks": "task",
+    "/api/whiteboard/assignments": "assignment",
+    "/api/whiteboard/announcements": "announcement"
+}
+ACTION_PATH = re.compile(r"^/api/whiteboard/tasks/(\d+)/(acknowledge|complete)$")
+ACTION_FIELDS = {"acknowledge": "is_acknowledged", "complete": "is_completed"}
+DELETE_ID_FIELDS = {"task": "task_id", "announcement": "announcement_id", "assignment": "assignment_id"}
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def make_item(item_type, item_id):
+    item = {
+        "id": item_id,
+        "type": item_type,
+        "title": f"{item_type} {item_id}",
+        "created_at": "2030-01-01 08:00:00"
+    }
+    if item_type == "task":
+        item.update(description="请按时完成", priority=1 + item_id % 3, due_date="2030-01-02 08:00:00",
+                    is_acknowledged=False, is_completed=False)
+    elif item_type == "assignment":
+        item.update(subject="数学", description="练习册第3页", due_date="2030-01-02 08:00:00")
+    else:
+        item.update(content="明天下午开家长会")
+    return item
+
+
+class FakeDlassServer:
+    def __init__(self, host="127.0.0.1", port=0):
+        self.lock = threading.Lock()
+        self.items = {}
+        self.version = 0
+        self.next_id = 1
+        # 推送事件日志，resume 时按 event_id 补发
+        self.events = []
+        # sid -> 连接参数里的主白板
+        self.main_boards = {}
+        self.counters = {"all": 0, "not_modified": 0, "list": 0, "action": 0, "heartbeat": 0,
+                         "socket_heartbeat": 0, "resume": 0, "connects": 0, "join_board": 0, "batch": 0}
+        self.batch_supported = True
+
+        self.sio = socketio.Server(async_mode="threading")
+        self.sio.on("connect", self.on_connect)
+        self.sio.on("heartbeat", self.on_heartbeat)
+        self.sio.on("resume", self.on_resume)
+        self.sio.on("join_board", self.on_join_board)
+
+        self.httpd = make_server(host, port, socketio.WSGIApp(self.sio, self.handle_http),
+                                 server_class=ThreadingWSGIServer, handler_class=QuietHandler)
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    # ---- 数据 ----
+
+    def populate(self, count):
+        # 三种类型平均分配
+        with self.lock:
+            self.items = {}
+            for i in range(count):
+                item_type = ("task", "assignment", "announcement")[i % 3]
+                self.items[(item_type, self.next_id)] = make_item(item_type, self.next_id)
+                self.next_id += 1
+            self.version += 1
+
+    def touch(self):
+        # 只改版本号，让下次条件请求拿到完整数据
+        with self.lock:
+            self.version += 1
+
+    def push(self, event, item_type, item=None, item_id=None, board_id=None):
+        # 所有白板共用同一份数据；指定 board_id 时写进事件，由客户端按它分发
+        with self.lock:
+            self.version += 1
+            if event.startswith("delete_"):
+                self.items.pop((item_type, item_id), None)
+                data = {DELETE_ID_FIELDS[item_type]: item_id}
+            else:
+                if item is None:
+                    item = make_item(item_type, self.next_id)
+                    self.next_id += 1
+                self.items[(item_type, item["id"])] = item
+                data = dict(item)
+            data.update(event_id=len(self.events) + 1, event_time=time.time(), board_version=self.version)
+            if board_id is not None:
+                data["board_id"] = board_id
+            self.events.append((event, data))
+        self.sio.emit(event, data)
+        return data
+
+    def payload(self, item_type=None):
+        with self.lock:
+            items = [item for (kind, _), item in self.items.items() if item_type in (None, kind)]
+            return {"success": True, "data": items, "board_version": self.version}
+
+    # ---- HTTP ----
+
+    def handle_http(self, environ, start_response):
+        method = environ["REQUEST_METHOD"]
+        path = environ.get("PATH_INFO", "")
+
+        if method == "GET" and path == "/api/whiteboard/all":
+            self.counters["all"] += 1
+            result = self.payload()
+            etag = '"%s"' % hashlib.sha1(str(result["board_version"]).encode()).hexdigest()
+            if environ.get("HTTP_IF_NONE_MATCH") == etag:
+                self.counters["not_modified"] += 1
+                start_response("304 Not Modified", [("ETag", etag)])
+                return [b""]
+            return self.respond(start_response, result, [("ETag", etag)])
+
+        if method == "GET" and path in LIST_PATHS:
+            self.counters["list"] += 1
+            return self.respond(start_response, self.payload(LIST_PATHS[path]))
+
+        if method == "POST" and path == "/api/whiteboard/tasks/batch" and self.batch_supported:
+            self.counters["batch"] += 1
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+            actions = json.loads(environ["wsgi.input"].read(length) or b"{}").get("actions", [])
+            results = []
+            for entry in actions:
+                ok = entry.get("action") in ACTION_FIELDS and self.apply_action(int(entry.get("task_id")), entry["action"])
+                results.append({"task_id": entry.get("task_id"), "action": entry.get("action"), "success": ok,
+                                "error": None if ok else "任务不存在"})
+            return self.respond(start_response, {"success": True, "results": results})
+
+        match = ACTION_PATH.match(path)
+        if method == "POST" and match:
+            self.counters["action"] += 1
+            if not self.apply_action(int(match.group(1)), match.group(2)):
+                return self.respond(start_response, {"success": False, "error": "任务不存在"}, status="404 Not Found")
+            return self.respond(start_response, {"success": True})
+
+        if method == "POST" and path == "/api/whiteboard/heartbeat":
+            self.counters["heartbeat"] += 1
+            return self.respond(start_response, {"success": True})
+
+        return self.respond(start_response, {"success": False, "error": "not found"}, status="404 Not Found")
+
+    def apply_action(self, task_id, action):
+        with self.lock:
+            task = self.items.get(("task", task_id))
+            if task is None:
+                return False
+            self.items[("task", task_id)] = dict(task, **{ACTION_FIELDS[action]: True})
+            self.version += 1
+        return True
+
+    @staticmethod
+    def respond(start_response, result, headers=(), status="200 OK"):
+        body = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        start_response(status, [("Content-Type", "application/json"),
+                                ("Content-Length", str(len(body)))] + list(headers))
+        return [body]
+
+    # ---- Socket.IO ----
+
+    def on_connect(self, sid, environ, auth=None):
+        self.counters["connects"] += 1
+        # 连接参数里的白板是这个连接的主白板，它的事件不带 board_id
+        query = parse_qs(environ.get("QUERY_STRING", ""))
+        self.main_boards[sid] = query.get("board_id", [""])[0]
+        self.sio.emit("connected", {"status": "success", "message": "ok"}, to=sid)
+
+    def on_heartbeat(self, sid, data):
+        self.counters["socket_heartbeat"] += 1
+
+    def on_join_board(self, sid, data):
+        self.counters["join_board"] += 1
+        if not (data or {}).get("board_id"):
+            return {"status": "error", "message": "缺少 board_id"}
+        return {"status": "ok"}
+
+    def on_resume(self, sid, data):
+        self.counters["resume"] += 1
+        last_event_id = (data or {}).get("last_event_id")
+        if last_event_id is None:
+            return {"status": "unsupported"}
+
+        # 只补发请求的白板的事件
+        board_id = data.get("board_id") or self.main_boards.get(sid, "")
+        main_board = self.main_boards.get(sid, "")
+        with self.lock:
+            missed = [event for event in self.events if event[1]["event_id"] > last_event_id
+                      and event[1].get("board_id", main_board) == board_id]
+        for event, payload in missed:
+            self.sio.emit(event, payload, to=sid)
+        return {"status": "ok", "replayed": len(missed)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--items", type=int, default=30)
+    args = parser.parse_args()
+
+    server = FakeDlassServer(args.host, args.port)
+    server.populate(args.items)
+    print(f"模拟服务器已启动: {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()